@@ -1,19 +1,15 @@
 from flask import Flask
 from flask_cors import CORS
 import os
-from dotenv import load_dotenv
+from config import Config
 from extensions import db, ma
 
-# Load environment variables
-load_dotenv()
-
-def create_app():
+def create_app(config_class=Config):
+    """Build and configure the WSGI app"""
     app = Flask(__name__)
     
     # Configure the app
-    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///tasklion.db')
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-key-please-change-in-production')
+    app.config.from_object(config_class)
 
     # Initialize extensions
     CORS(app)
@@ -22,12 +18,12 @@ def create_app():
 
     # Ensure instance folder exists
     try:
-        os.makedirs('instance', exist_ok=True)
+        os.makedirs(app.instance_path, exist_ok=True)
     except OSError as e:
         print(f"Warning: Could not create instance directory: {e}")
 
     # Import models
-    from models.task import Task
+    from models.task import Task, ArchivedTask, TaskDependency
 
     # Import routes
     from routes import tasks_bp
@@ -37,10 +33,13 @@ def create_app():
 
     return app
 
-app = create_app()
-
 if __name__ == '__main__':
+    app = create_app()
     with app.app_context():
         # Create database tables
         db.create_all()
-    app.run(debug=True) 
\ No newline at end of file
+    # Archive in the serving process only, not in the debug reloader's watcher
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        from services.archiver import start_archiver
+        start_archiver(app)
+    app.run(debug=True)
@@ -0,0 +1,88 @@
+"""
+ASGI entry point serving the async variant of the tasks API.
+
+    hypercorn asgi:app --bind 0.0.0.0:5000
+
+Shares the models, schemas and database with the WSGI app in app.py.
+"""
+
+import os
+from quart import Quart
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from config import Config
+
+def resolve_database_url(database_url, instance_path):
+    """Resolve relative SQLite paths against the instance folder, as Flask-SQLAlchemy does"""
+    url = make_url(database_url)
+    if url.drivername == 'sqlite' and url.database and url.database != ':memory:' and not os.path.isabs(url.database):
+        url = url.set(database=os.path.join(instance_path, url.database))
+    return url
+
+def async_database_url(database_url, instance_path):
+    """Point a sync SQLAlchemy URL at the matching async driver"""
+    url = resolve_database_url(database_url, instance_path)
+    if url.drivername == 'sqlite':
+        url = url.set(drivername='sqlite+aiosqlite')
+    return url
+
+def create_app(config_class=Config):
+    app = Quart(__name__)
+
+    # Configure the app
+    app.config.from_object(config_class)
+
+    # Ensure instance folder exists
+    try:
+        os.makedirs(app.instance_path, exist_ok=True)
+    except OSError as e:
+        print(f"Warning: Could not create instance directory: {e}")
+
+    engine = create_async_engine(async_database_url(app.config['SQLALCHEMY_DATABASE_URI'], app.instance_path))
+    app.extensions['async_engine'] = engine
+    app.extensions['async_session'] = async_sessionmaker(engine, expire_on_commit=False)
+    # For work done on threads off the event loop, e.g. rebuilding the dependency graph
+    sync_engine = create_engine(resolve_database_url(app.config['SQLALCHEMY_DATABASE_URI'], app.instance_path))
+    app.extensions['sync_engine'] = sync_engine
+
+    @app.before_serving
+    async def open_http_client():
+        import httpx
+
+        app.extensions['http_client'] = httpx.AsyncClient(timeout=30)
+
+    @app.before_serving
+    async def start_archiver():
+        import asyncio
+        from services.archiver import archive_periodically
+
+        # Move old completed tasks out of the hot table in the background
+        app.extensions['archiver'] = asyncio.get_running_loop().create_task(archive_periodically(app))
+
+    @app.after_serving
+    async def close_resources():
+        app.extensions['archiver'].cancel()
+        await app.extensions['http_client'].aclose()
+        await engine.dispose()
+        sync_engine.dispose()
+
+    @app.after_request
+    async def add_cors_headers(response):
+        response.headers['Access-Control-Allow-Origin'] = '*'
+        response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
+        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
+        return response
+
+    # Import routes
+    from routes.async_tasks import async_tasks_bp
+
+    # Register blueprints
+    app.register_blueprint(async_tasks_bp, url_prefix='/api')
+
+    return app
+
+app = create_app()
+
+if __name__ == '__main__':
+    app.run(debug=True)
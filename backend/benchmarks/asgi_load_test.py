@@ -0,0 +1,185 @@
+"""
+Load test: WSGI app (app.py) vs ASGI app (asgi.py) under I/O-bound analysis.
+
+Both apps analyze tasks through a local stub of the Gemini API that answers
+after a fixed delay, so each request spends most of its time waiting on the
+network. The WSGI app is served by a threaded server capped at --wsgi-workers
+concurrent requests (the equivalent of a gunicorn pool); the ASGI app runs on
+hypercorn in a single event loop.
+
+Every request analyzes a different task and the rate limit is raised above the
+request count: all requests come from 127.0.0.1, and repeated analyses of one
+task would otherwise be rejected (429) or coalesced into a single call.
+
+Run from the backend directory:
+
+    python -m benchmarks.asgi_load_test --requests 200 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_stub_analyzer(delay):
+    """Serve a Gemini-compatible endpoint that answers '0.7|Stub analysis.' after `delay` seconds"""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            time.sleep(delay)
+            body = json.dumps({
+                'candidates': [{'content': {'parts': [{'text': '0.7|Stub analysis.'}]}}]
+            }).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_wsgi_server(flask_app, workers):
+    """Serve the Flask app with at most `workers` requests handled at once"""
+    from werkzeug.serving import make_server
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    slots = threading.BoundedSemaphore(workers)
+
+    def limited_app(environ, start_response):
+        with slots:
+            return flask_app(environ, start_response)
+
+    server = make_server('127.0.0.1', 0, limited_app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def start_asgi_server(quart_app):
+    """Serve the Quart app with hypercorn on a background event loop"""
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config as HypercornConfig
+
+    config = HypercornConfig()
+    config.bind = ['127.0.0.1:0']
+    config.accesslog = None
+    config.errorlog = None
+
+    shutdown = threading.Event()
+    bound = []
+    loop = asyncio.new_event_loop()
+
+    async def run():
+        async def shutdown_trigger():
+            while not shutdown.is_set():
+                await asyncio.sleep(0.1)
+
+        sockets = config.create_sockets()
+        bound.append(sockets.insecure_sockets[0].getsockname())
+        config.bind = [f"fd://{sockets.insecure_sockets[0].fileno()}"]
+        await serve(quart_app, config, shutdown_trigger=shutdown_trigger)
+
+    thread = threading.Thread(target=loop.run_until_complete, args=(run(),), daemon=True)
+    thread.start()
+    while not bound:
+        time.sleep(0.05)
+    host, port = bound[0][:2]
+    return shutdown, f"http://{host}:{port}"
+
+
+async def run_load(base_url, task_ids, concurrency):
+    """Analyze every task in `task_ids` with `concurrency` requests in flight; return (seconds, failures)"""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        semaphore = asyncio.Semaphore(concurrency)
+        failures = 0
+
+        async def one(task_id):
+            nonlocal failures
+            async with semaphore:
+                response = await client.get(f"/api/tasks/{task_id}/analyze")
+                if response.status_code != 200:
+                    failures += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(task_id) for task_id in task_ids))
+        return time.perf_counter() - start, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--delay', type=float, default=0.2, help='stub analyzer latency in seconds')
+    parser.add_argument('--wsgi-workers', type=int, default=4)
+    args = parser.parse_args()
+
+    stub = start_stub_analyzer(args.delay)
+    os.environ['GEMINI_API_URL'] = f"http://127.0.0.1:{stub.server_port}/analyze"
+    os.environ['GEMINI_API_KEY'] = 'stub'
+    os.environ['GEMINI_MAX_CONCURRENCY'] = str(args.concurrency)
+    os.environ['ANALYZER_BACKEND'] = 'gemini'
+    # Measure serving capacity, not the per-client limiter
+    os.environ['RATE_LIMIT_CAPACITY'] = str(args.requests)
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'load_test.db')
+    sys.path.insert(0, BACKEND_DIR)
+
+    # The apps print every analysis; keep the report readable
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        from app import create_app as create_wsgi_app
+        from asgi import create_app as create_asgi_app
+        from extensions import db
+        from models.task import Task
+
+        flask_app = create_wsgi_app()
+        with flask_app.app_context():
+            db.create_all()
+            tasks = [
+                Task(title=f'Prepare quarterly report {index + 1}', description='Numbers for the board meeting')
+                for index in range(args.requests)
+            ]
+            db.session.add_all(tasks)
+            db.session.commit()
+            task_ids = [task.id for task in tasks]
+
+        wsgi_server, wsgi_url = start_wsgi_server(flask_app, args.wsgi_workers)
+        asgi_shutdown, asgi_url = start_asgi_server(create_asgi_app())
+
+        results = {}
+        for name, url in (('WSGI', wsgi_url), ('ASGI', asgi_url)):
+            results[name] = asyncio.run(run_load(url, task_ids, args.concurrency))
+
+        wsgi_server.shutdown()
+        asgi_shutdown.set()
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+
+    print(f"{args.requests} analyze requests, {args.concurrency} concurrent, "
+          f"stub latency {args.delay * 1000:.0f} ms, {args.wsgi_workers} WSGI workers")
+    for name, (elapsed, failures) in results.items():
+        print(f"{name}: {elapsed:6.2f} s  {args.requests / elapsed:7.1f} req/s  {failures} failed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Dependency graph benchmark: full load vs incremental updates.
+
+Fills a temporary SQLite database with tasks and random acyclic dependencies,
+then measures loading the graph from the database and the average cost of
+single edge additions/removals and deadline changes, and of computing the
+optimizer weights (which read the precomputed slack).
+
+Run from the backend directory:
+
+    python -m benchmarks.dependency_benchmark --tasks 100000 --edges 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def fill_database(task_count, edge_count, seed):
+    from extensions import db
+    from models.task import Task, TaskDependency
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    db.session.execute(Task.__table__.insert(), [
+        {
+            'id': i,
+            'title': f"Task {i}",
+            'deadline': now + timedelta(days=rng.uniform(1, 60)) if rng.random() < 0.5 else None,
+            'priority': 'medium',
+            'completed': False,
+            'created_at': now,
+        }
+        for i in range(1, task_count + 1)
+    ])
+    # Edges always point from a lower to a higher id, so the graph is acyclic
+    edges = set()
+    while len(edges) < edge_count:
+        blocker, task = sorted(rng.sample(range(1, task_count + 1), 2))
+        edges.add((task, blocker))
+    db.session.execute(
+        TaskDependency.__table__.insert(),
+        [{'task_id': task, 'depends_on_id': blocker} for task, blocker in edges]
+    )
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--edges', type=int, default=100000)
+    parser.add_argument('--updates', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'dependency_benchmark.db')
+
+    from app import create_app
+    from extensions import db
+    from services.dependency_graph import dependency_graph, DependencyCycleError
+    from services.optimizer import task_weights
+    from services.snapshot import TaskSnapshot
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        fill_database(args.tasks, args.edges, args.seed)
+
+        start = time.perf_counter()
+        dependency_graph.ensure_loaded(db.session)
+        load_seconds = time.perf_counter() - start
+
+        snapshot = TaskSnapshot.load(db.session, completed=False)
+        tasks = list(snapshot)
+
+    rng = random.Random(args.seed + 1)
+    now = datetime.utcnow()
+
+    added, cycles = [], 0
+    start = time.perf_counter()
+    for _ in range(args.updates):
+        task, blocker = rng.sample(tasks, 2)
+        try:
+            dependency_graph.add_dependency(task, blocker)
+            added.append((task.id, blocker.id))
+        except DependencyCycleError:
+            cycles += 1
+    add_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for task_id, blocker_id in added:
+        dependency_graph.remove_dependency(task_id, blocker_id)
+    remove_seconds = time.perf_counter() - start
+
+    # Snapshot deadlines are read-only, so deadline changes go through stand-in tasks
+    start = time.perf_counter()
+    for _ in range(args.updates):
+        task = rng.choice(tasks)
+        dependency_graph.update_task(SimpleNamespace(
+            id=task.id, completed=False, deadline=now + timedelta(days=rng.uniform(1, 60))
+        ))
+    deadline_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    task_weights(snapshot)
+    weights_seconds = time.perf_counter() - start
+
+    print(f"{args.tasks} tasks, {args.edges} dependencies")
+    print(f"full load from database       {load_seconds * 1000:>10.1f}ms")
+    print(f"add dependency (avg)          {add_seconds / args.updates * 1e6:>10.1f}us  ({cycles} rejected as cycles)")
+    print(f"remove dependency (avg)       {remove_seconds / max(len(added), 1) * 1e6:>10.1f}us")
+    print(f"deadline change (avg)         {deadline_seconds / args.updates * 1e6:>10.1f}us")
+    print(f"optimizer weights with slack  {weights_seconds * 1000:>10.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
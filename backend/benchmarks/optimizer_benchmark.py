@@ -0,0 +1,84 @@
+"""
+Optimizer benchmark: stochastic lion search vs the exact assignment.
+
+Builds synthetic boards of pending tasks, runs lion_optimization in each mode
+and reports wall time and fitness (calculate_fitness on the same weights).
+Exits non-zero if the exact mode ever scores below the lion search.
+
+Run from the backend directory:
+
+    python -m benchmarks.optimizer_benchmark --sizes 10 100 1000 --exact-sizes 100000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.optimizer import lion_optimization, task_weights, calculate_fitness
+
+
+def make_tasks(count, seed):
+    """Pending tasks with a mix of deadlines, ages and importance scores"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    tasks = []
+    for i in range(count):
+        deadline = now + timedelta(days=rng.uniform(-5, 40)) if rng.random() < 0.7 else None
+        tasks.append(SimpleNamespace(
+            id=i,
+            title=f"Task {i}",
+            description='',
+            deadline=deadline,
+            created_at=now - timedelta(days=rng.uniform(0, 30)),
+            importance_score=rng.random(),
+            importance_explanation='',
+        ))
+    return tasks
+
+
+def run(tasks, mode):
+    """Return (seconds, fitness) of one optimization run"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        priorities = lion_optimization(tasks, mode=mode)
+        elapsed = time.perf_counter() - start
+    return elapsed, calculate_fitness(priorities, task_weights(tasks))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000],
+                        help='board sizes to run every mode on')
+    parser.add_argument('--exact-sizes', type=int, nargs='*', default=[100000],
+                        help='larger board sizes to run the exact mode on alone')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    failures = 0
+    print(f"{'tasks':>8}  {'mode':<7} {'time':>10}  {'fitness':>12}")
+    for size in args.sizes:
+        tasks = make_tasks(size, args.seed)
+        results = {mode: run(tasks, mode) for mode in ('lion', 'seeded', 'exact')}
+        for mode, (elapsed, fitness) in results.items():
+            print(f"{size:>8}  {mode:<7} {elapsed * 1000:>8.1f}ms  {fitness:>12.3f}")
+        if results['exact'][1] < results['lion'][1] - 1e-9:
+            print(f"  exact scored below lion on {size} tasks")
+            failures += 1
+
+    for size in args.exact_sizes:
+        elapsed, fitness = run(make_tasks(size, args.seed), 'exact')
+        print(f"{size:>8}  {'exact':<7} {elapsed * 1000:>8.1f}ms  {fitness:>12.3f}")
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Snapshot benchmark: loading a large board as ORM Task objects vs a TaskSnapshot.
+
+Fills a temporary SQLite database with pending tasks, then for each loader
+measures load time, peak traced memory (tracemalloc) and the time of an exact
+optimization over the loaded tasks.
+
+Run from the backend directory:
+
+    python -m benchmarks.snapshot_benchmark --tasks 50000
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def fill_database(count, seed):
+    from extensions import db
+    from models.task import Task
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    rows = []
+    for i in range(count):
+        rows.append({
+            'title': f"Task {i}: prepare the weekly report",
+            'description': "Collect numbers from every team and draft the summary. " * rng.randint(0, 4),
+            'deadline': now + timedelta(days=rng.uniform(-5, 40)) if rng.random() < 0.7 else None,
+            'priority': rng.choice(['low', 'medium', 'high']),
+            'completed': False,
+            'created_at': now - timedelta(days=rng.uniform(0, 30)),
+            'importance_score': rng.random(),
+            'importance_explanation': 'Seeded by benchmark.',
+            'rank_score': rng.random(),
+        })
+    db.session.execute(Task.__table__.insert(), rows)
+    db.session.commit()
+
+
+def measure(load):
+    """Return (load seconds, peak MiB while loading, optimize seconds)"""
+    from services.optimizer import lion_optimization
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    tasks = load()
+    load_seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        lion_optimization(tasks, mode='exact')
+        optimize_seconds = time.perf_counter() - start
+    return load_seconds, peak / (1024 * 1024), optimize_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'snapshot_benchmark.db')
+
+    from app import create_app
+    from extensions import db
+    from models.task import Task
+    from services.snapshot import TaskSnapshot
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        fill_database(args.tasks, args.seed)
+
+        loaders = {
+            'ORM Task objects': lambda: Task.query.filter_by(completed=False).all(),
+            'TaskSnapshot': lambda: TaskSnapshot.load(db.session, completed=False),
+        }
+
+        print(f"{args.tasks} pending tasks")
+        print(f"{'loader':<18} {'load':>10} {'peak memory':>13} {'optimize':>10}")
+        for name, load in loaders.items():
+            load_seconds, peak_mib, optimize_seconds = measure(load)
+            # Start every loader from an empty identity map
+            db.session.expunge_all()
+            print(f"{name:<18} {load_seconds * 1000:>8.0f}ms {peak_mib:>10.1f}MiB {optimize_seconds * 1000:>8.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Startup benchmark: how long a fresh interpreter takes to import and build the app.
+
+Each run starts a new Python process (so nothing is cached in sys.modules), times
+`create_app()` end to end, and records per-module import cost with -X importtime.
+It also reports whether heavy optional modules were pulled in at startup; they
+should only load on first use of the optimizer / Gemini paths.
+
+Run from the backend directory:
+
+    python -m benchmarks.startup_benchmark --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be imported just to start the app
+LAZY_MODULES = ('numpy', 'requests', 'httpx', 'quart')
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+create_app()
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'seconds': elapsed,
+    'loaded': [name for name in {LAZY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+def run_probe():
+    """Start the app in a fresh interpreter; return (result, importtime lines)"""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    return result, completed.stderr.splitlines()
+
+
+def top_level_imports(importtime_lines):
+    """Cumulative import time (microseconds) of each module imported at depth 0 or 1"""
+    costs = {}
+    for line in importtime_lines:
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        # -X importtime indents nested imports by two spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth <= 1:
+            costs[name.strip()] = int(cumulative_us)
+    return costs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help='number of most expensive imports to list')
+    args = parser.parse_args()
+
+    timings = []
+    import_costs = {}
+    loaded = set()
+    for _ in range(args.runs):
+        result, importtime_lines = run_probe()
+        timings.append(result['seconds'])
+        loaded.update(result['loaded'])
+        for package, cost in top_level_imports(importtime_lines).items():
+            import_costs.setdefault(package, []).append(cost)
+
+    print(f"create_app() in a fresh interpreter, {args.runs} runs")
+    print(f"median {statistics.median(timings) * 1000:.1f} ms  "
+          f"min {min(timings) * 1000:.1f} ms  max {max(timings) * 1000:.1f} ms")
+
+    print("\nMost expensive imports (median cumulative):")
+    medians = sorted(((statistics.median(costs), package) for package, costs in import_costs.items()), reverse=True)
+    for cost, package in medians[:args.top]:
+        print(f"  {cost / 1000:8.1f} ms  {package}")
+
+    if loaded:
+        print(f"\nWARNING: heavy modules imported at startup: {', '.join(sorted(loaded))}")
+    else:
+        print(f"\nNone of {', '.join(LAZY_MODULES)} imported at startup")
+    return 1 if loaded else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Wire format benchmark: payload size and encode time of a task list.
+
+Compares the default tasks_schema.dump + JSON response body with the columnar
+JSON and MessagePack encodings, each uncompressed, gzip'ed and brotli'ed.
+
+Run from the backend directory:
+
+    python -m benchmarks.wire_format_benchmark --tasks 5000
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_tasks(count, seed):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    tasks = []
+    for i in range(count):
+        completed = rng.random() < 0.3
+        tasks.append(SimpleNamespace(
+            id=i + 1,
+            title=f"Task {i}: prepare the weekly report",
+            description="Collect numbers from every team and draft the summary. " * rng.randint(0, 3),
+            deadline=now + timedelta(days=rng.uniform(-5, 40)) if rng.random() < 0.7 else None,
+            priority=rng.choice(['low', 'medium', 'high']),
+            completed=completed,
+            created_at=now - timedelta(days=rng.uniform(0, 30)),
+            completed_at=now - timedelta(days=rng.uniform(0, 5)) if completed else None,
+            importance_score=rng.random(),
+            importance_explanation="Due within a week. Contains priority indicators: report.",
+        ))
+    return tasks
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    from schemas.task import tasks_schema
+    from services.wire_format import brotli_available, encode_tasks, msgpack_available
+
+    tasks = make_tasks(args.tasks, args.seed)
+
+    encoders = {
+        'tasks_schema.dump + JSON': lambda: json.dumps(tasks_schema.dump(tasks)).encode(),
+        'columnar JSON': lambda: encode_tasks(tasks, 'columnar')[0],
+    }
+    if msgpack_available():
+        encoders['columnar MessagePack'] = lambda: encode_tasks(tasks, 'msgpack')[0]
+
+    compressors = {'gzip': lambda body: gzip.compress(body, compresslevel=6)}
+    if brotli_available():
+        import brotli
+        compressors['br'] = lambda body: brotli.compress(body, quality=5)
+
+    print(f"{args.tasks} tasks")
+    header = f"{'format':<26} {'encode':>9} {'bytes':>10}"
+    for name in compressors:
+        header += f" {name + ' bytes':>11} {name + ' time':>9}"
+    print(header)
+
+    for name, encode in encoders.items():
+        body, encode_seconds = timed(encode, args.repeat)
+        line = f"{name:<26} {encode_seconds * 1000:>7.1f}ms {len(body):>10}"
+        for compress in compressors.values():
+            compressed, compress_seconds = timed(lambda: compress(body), args.repeat)
+            line += f" {len(compressed):>11} {compress_seconds * 1000:>7.1f}ms"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
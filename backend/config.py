@@ -1,8 +1,33 @@
 import os
+from dotenv import load_dotenv
 
-basedir = os.path.abspath(os.path.dirname(__file__))
+# Load environment variables before the settings below read them
+load_dotenv()
 
 class Config:
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(basedir, 'instance', 'tasks.db')
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///tasklion.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-key-please-change-in-production' 
\ No newline at end of file
+    SECRET_KEY = os.getenv('SECRET_KEY', 'dev-key-please-change-in-production')
+    ANALYZER_BACKEND = os.getenv('ANALYZER_BACKEND', 'builtin')  # 'builtin' or 'gemini'
+    OPTIMIZER_MODE = os.getenv('OPTIMIZER_MODE', 'lion')  # 'lion', 'exact' or 'seeded'
+
+    # Per-client token bucket for the expensive optimize/analyze endpoints
+    RATE_LIMIT_CAPACITY = int(os.getenv('RATE_LIMIT_CAPACITY', '10'))
+    RATE_LIMIT_REFILL_PER_SECOND = float(os.getenv('RATE_LIMIT_REFILL_PER_SECOND', '0.5'))
+
+    # How often GET /tasks/stats rebuilds its incrementally maintained counters from the table
+    STATS_RECONCILE_SECONDS = float(os.getenv('STATS_RECONCILE_SECONDS', '300'))
+
+    # Completed tasks older than this move to the archived_task table (0 disables archival)
+    ARCHIVE_AFTER_DAYS = float(os.getenv('ARCHIVE_AFTER_DAYS', '30'))
+    ARCHIVE_INTERVAL_SECONDS = float(os.getenv('ARCHIVE_INTERVAL_SECONDS', '3600'))
+    ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', '500'))
+    # Archive from the server process (wsgi.py / asgi.py). Every worker runs its own archiver, so with
+    # several workers turn this off and schedule `python -m services.archiver` (a single pass) instead
+    RUN_ARCHIVER = os.getenv('RUN_ARCHIVER', 'true').lower() in ('1', 'true', 'yes')
+
+    # How often each process rebuilds its dependency graph to pick up other workers' changes
+    DEPENDENCY_RELOAD_SECONDS = float(os.getenv('DEPENDENCY_RELOAD_SECONDS', '300'))
+
+    # Task API responses at least this large are gzip/brotli-compressed for clients that accept it
+    COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))
@@ -1,15 +1,12 @@
-from app import app
+from sqlalchemy import inspect
+from app import create_app
 from extensions import db
-from models.task import Task
-import os
-from dotenv import load_dotenv
 
 def init_db():
-    # Load environment variables
-    load_dotenv()
+    app = create_app()
     
     print("Initializing database...")
-    print(f"Using database URL: {os.getenv('DATABASE_URL', 'sqlite:///tasklion.db')}")
+    print(f"Using database URL: {app.config['SQLALCHEMY_DATABASE_URI']}")
     
     try:
         with app.app_context():
@@ -18,7 +15,7 @@ def init_db():
             print("Database tables created successfully")
             
             # Verify tables were created
-            tables = db.engine.table_names()
+            tables = inspect(db.engine).get_table_names()
             print(f"Created tables: {', '.join(tables)}")
             
     except Exception as e:
@@ -26,4 +23,4 @@ def init_db():
         raise
 
 if __name__ == "__main__":
-    init_db() 
\ No newline at end of file
+    init_db()
@@ -0,0 +1,27 @@
+"""
+Add the analyzed_at column to an existing task table.
+
+Existing rows keep a NULL analyzed_at, so the score scheduler re-scores them
+once on the next start; from then on only tasks that crossed a deadline/age
+boundary since their last analysis are re-scored when a process starts.
+
+Run from the backend directory: python -m migrations.add_analyzed_at
+"""
+
+from sqlalchemy import inspect, text
+from app import create_app
+from extensions import db
+
+def upgrade():
+    app = create_app()
+    with app.app_context():
+        columns = {column['name'] for column in inspect(db.engine).get_columns('task')}
+        if 'analyzed_at' in columns:
+            print("The task table already has analyzed_at")
+            return
+        db.session.execute(text('ALTER TABLE task ADD COLUMN analyzed_at DATETIME'))
+        db.session.commit()
+        print("Added analyzed_at to the task table")
+
+if __name__ == '__main__':
+    upgrade()
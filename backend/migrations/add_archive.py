@@ -0,0 +1,35 @@
+"""
+Add the completed_at column and its index to an existing task table, create the
+archived_task table, and backfill completed_at for tasks that are already completed.
+
+Existing completed tasks get the migration time as their completion time, so
+they are archived ARCHIVE_AFTER_DAYS after the migration rather than all at once.
+
+Run from the backend directory: python -m migrations.add_archive
+"""
+
+from datetime import datetime
+from sqlalchemy import inspect, text
+from app import create_app
+from extensions import db
+from models.task import ArchivedTask
+
+def upgrade():
+    app = create_app()
+    with app.app_context():
+        columns = {column['name'] for column in inspect(db.engine).get_columns('task')}
+        if 'completed_at' not in columns:
+            db.session.execute(text('ALTER TABLE task ADD COLUMN completed_at DATETIME'))
+        db.session.execute(text('CREATE INDEX IF NOT EXISTS ix_task_completed_at ON task (completed, completed_at)'))
+
+        backfilled = db.session.execute(
+            text('UPDATE task SET completed_at = :now WHERE completed = 1 AND completed_at IS NULL'),
+            {'now': datetime.utcnow()}
+        ).rowcount
+        db.session.commit()
+
+        ArchivedTask.__table__.create(db.engine, checkfirst=True)
+        print(f"Backfilled completed_at for {backfilled} task(s)")
+
+if __name__ == '__main__':
+    upgrade()
@@ -0,0 +1,34 @@
+"""
+Add the rank_score column and its index to an existing task table,
+and backfill it for the rows that are already there.
+
+Run from the backend directory: python -m migrations.add_rank_score
+"""
+
+from sqlalchemy import bindparam, inspect, text
+from app import create_app
+from extensions import db
+from models.task import Task, compute_rank
+
+def upgrade():
+    app = create_app()
+    with app.app_context():
+        columns = {column['name'] for column in inspect(db.engine).get_columns('task')}
+        if 'rank_score' not in columns:
+            db.session.execute(text('ALTER TABLE task ADD COLUMN rank_score FLOAT'))
+        db.session.execute(text('CREATE INDEX IF NOT EXISTS ix_task_completed_rank ON task (completed, rank_score)'))
+
+        rows = db.session.query(Task.id, Task.priority, Task.importance_score).all()
+        if rows:
+            db.session.execute(
+                Task.__table__.update().where(Task.__table__.c.id == bindparam('task_id')),
+                [
+                    {'task_id': row.id, 'rank_score': compute_rank(row.priority, row.importance_score)}
+                    for row in rows
+                ]
+            )
+        db.session.commit()
+        print(f"Backfilled rank_score for {len(rows)} task(s)")
+
+if __name__ == '__main__':
+    upgrade()
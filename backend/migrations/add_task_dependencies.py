@@ -0,0 +1,18 @@
+"""
+Create the task_dependency table in an existing database.
+
+Run from the backend directory: python -m migrations.add_task_dependencies
+"""
+
+from app import create_app
+from extensions import db
+from models.task import TaskDependency
+
+def upgrade():
+    app = create_app()
+    with app.app_context():
+        TaskDependency.__table__.create(db.engine, checkfirst=True)
+        print("Created the task_dependency table")
+
+if __name__ == '__main__':
+    upgrade()
@@ -0,0 +1,67 @@
+"""
+Rebuild the task table with AUTOINCREMENT ids on SQLite.
+
+Without AUTOINCREMENT, SQLite hands out max(id) + 1 to new rows, so once the
+newest task is deleted a new task can get the id of an archived one. The
+archiver then fails on the duplicate archived_task id and the archived task
+can no longer be restored. SQLite can't add AUTOINCREMENT to an existing table,
+so the table is copied into a new one, and the id sequence starts above every
+id in use by the task or archived_task table.
+
+Run from the backend directory: python -m migrations.task_autoincrement
+"""
+
+from sqlalchemy import MetaData, inspect, text
+from app import create_app
+from extensions import db
+from models.task import Task, ArchivedTask
+from services.search import FTS_SETUP_STATEMENTS
+
+def upgrade():
+    app = create_app()
+    with app.app_context():
+        if db.engine.dialect.name != 'sqlite':
+            print("Only SQLite reuses ids; nothing to do")
+            return
+
+        with db.engine.begin() as connection:
+            table_sql = connection.execute(
+                text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'task'")
+            ).scalar()
+            if 'AUTOINCREMENT' in table_sql.upper():
+                print("The task table already uses AUTOINCREMENT")
+                return
+
+            existing = {column['name'] for column in inspect(connection).get_columns('task')}
+            columns = ', '.join(column.name for column in Task.__table__.columns if column.name in existing)
+
+            # The new table brings the indexes along under the same names
+            for index in Task.__table__.indexes:
+                connection.execute(text(f'DROP INDEX IF EXISTS {index.name}'))
+            Task.__table__.to_metadata(MetaData(), name='task_new').create(connection)
+            connection.execute(text(f'INSERT INTO task_new ({columns}) SELECT {columns} FROM task'))
+            # Also drops the FTS triggers; they are recreated below
+            connection.execute(text('DROP TABLE task'))
+            connection.execute(text('ALTER TABLE task_new RENAME TO task'))
+
+            ArchivedTask.__table__.create(connection, checkfirst=True)
+            last_id = connection.execute(text(
+                'SELECT MAX(COALESCE((SELECT MAX(id) FROM task), 0), COALESCE((SELECT MAX(id) FROM archived_task), 0))'
+            )).scalar()
+            connection.execute(text("DELETE FROM sqlite_sequence WHERE name = 'task'"))
+            connection.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES ('task', :seq)"), {'seq': last_id})
+
+            if connection.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'task_fts'")).first():
+                for statement in FTS_SETUP_STATEMENTS:
+                    connection.execute(text(statement))
+
+            conflicts = connection.execute(
+                text('SELECT COUNT(*) FROM archived_task WHERE id IN (SELECT id FROM task)')
+            ).scalar()
+
+        print(f"Rebuilt the task table; new task ids start after {last_id}")
+        if conflicts:
+            print(f"Warning: {conflicts} archived task(s) share their id with a live task and can't be restored")
+
+if __name__ == '__main__':
+    upgrade()
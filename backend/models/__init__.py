@@ -1,3 +1,3 @@
-from .task import Task
+from .task import Task, ArchivedTask, TaskDependency
 
-__all__ = ['Task'] 
\ No newline at end of file
+__all__ = ['Task', 'ArchivedTask', 'TaskDependency']
@@ -1,7 +1,33 @@
+import itertools
 from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 from extensions import db
 
+# Weight of each priority level in the "what should I do next" rank
+PRIORITY_RANK = {
+    'high': 1.0,
+    'medium': 0.6,
+    'low': 0.3,
+}
+
+def compute_rank(priority, importance_score):
+    """
+    Combined rank used to order pending tasks.
+    Deadline proximity is already folded into importance_score by the analyzer.
+    """
+    priority_weight = PRIORITY_RANK.get((priority or 'medium').lower(), PRIORITY_RANK['medium'])
+    importance_weight = importance_score if importance_score is not None else 0.5
+    return priority_weight * 0.5 + importance_weight * 0.5
+
 class Task(db.Model):
+    __table_args__ = (
+        db.Index('ix_task_completed_rank', 'completed', 'rank_score'),
+        db.Index('ix_task_completed_at', 'completed', 'completed_at'),
+        # Never reuse the id of a deleted row: archived tasks keep their id and must be restorable
+        {'sqlite_autoincrement': True},
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
@@ -9,5 +35,87 @@ class Task(db.Model):
     priority = db.Column(db.String(10), default='medium')
     completed = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    completed_at = db.Column(db.DateTime)  # Set when the task is completed, cleared when reopened
     importance_score = db.Column(db.Float)  # Gemini's importance score
-    importance_explanation = db.Column(db.Text)  # Gemini's explanation 
\ No newline at end of file
+    importance_explanation = db.Column(db.Text)  # Gemini's explanation
+    analyzed_at = db.Column(db.DateTime)  # When importance_score was last computed
+    rank_score = db.Column(db.Float)  # compute_rank(priority, importance_score), kept in sync on flush
+
+class TaskDependency(db.Model):
+    """Edge of the dependency graph: task `task_id` can't start before `depends_on_id` is completed"""
+    __tablename__ = 'task_dependency'
+    __table_args__ = (
+        db.Index('ix_task_dependency_depends_on', 'depends_on_id'),
+    )
+
+    task_id = db.Column(db.Integer, db.ForeignKey('task.id', ondelete='CASCADE'), primary_key=True)
+    depends_on_id = db.Column(db.Integer, db.ForeignKey('task.id', ondelete='CASCADE'), primary_key=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# Columns copied verbatim between the hot task table and the archive
+ARCHIVED_FIELDS = (
+    'id', 'title', 'description', 'deadline', 'priority', 'completed', 'created_at',
+    'completed_at', 'importance_score', 'importance_explanation', 'rank_score',
+)
+
+class ArchivedTask(db.Model):
+    """Completed task moved out of the hot task table by the archiver; keeps its original id, which no new task reuses"""
+    __tablename__ = 'archived_task'
+    __table_args__ = (
+        db.Index('ix_archived_task_completed_at', 'completed_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text)
+    deadline = db.Column(db.DateTime)
+    priority = db.Column(db.String(10), default='medium')
+    completed = db.Column(db.Boolean, default=True)
+    created_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
+    importance_score = db.Column(db.Float)
+    importance_explanation = db.Column(db.Text)
+    rank_score = db.Column(db.Float)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+@event.listens_for(Task, 'before_insert')
+@event.listens_for(Task, 'before_update')
+def update_rank_score(mapper, connection, task):
+    task.rank_score = compute_rank(task.priority, task.importance_score)
+
+@event.listens_for(Task, 'before_insert')
+@event.listens_for(Task, 'before_update')
+def update_completed_at(mapper, connection, task):
+    if not task.completed:
+        task.completed_at = None
+    elif task.completed_at is None:
+        task.completed_at = datetime.utcnow()
+
+# Monotonic version of the task set, bumped after every commit that changed a task.
+# Used to key cached / coalesced computations over the whole board.
+_task_set_versions = itertools.count(1)
+_task_set_version = 0
+
+def task_set_version():
+    return _task_set_version
+
+@event.listens_for(Session, 'after_flush')
+def mark_tasks_changed(session, flush_context):
+    if any(isinstance(obj, Task) for obj in itertools.chain(session.new, session.dirty, session.deleted)):
+        session.info['tasks_changed'] = True
+
+@event.listens_for(Session, 'do_orm_execute')
+def mark_bulk_task_changes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        if orm_execute_state.bind_mapper is not None and orm_execute_state.bind_mapper.class_ is Task:
+            orm_execute_state.session.info['tasks_changed'] = True
+
+@event.listens_for(Session, 'after_commit')
+def bump_task_set_version(session):
+    global _task_set_version
+    if session.info.pop('tasks_changed', False):
+        _task_set_version = next(_task_set_versions)
+
+@event.listens_for(Session, 'after_rollback')
+def discard_task_changes(session):
+    session.info.pop('tasks_changed', None)
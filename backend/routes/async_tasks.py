@@ -0,0 +1,435 @@
+"""
+Async variant of the tasks API, served by the ASGI app in asgi.py.
+
+Handlers talk to the database through an AsyncSession (aiosqlite), call Gemini
+through a shared httpx.AsyncClient and run the CPU-bound optimizer in a thread
+pool, so a slow analysis or optimization no longer pins a worker thread.
+"""
+
+import asyncio
+import math
+from datetime import datetime
+from functools import partial, wraps
+
+from quart import Blueprint, current_app, request, jsonify
+from sqlalchemy import delete, or_, select, update
+
+from models.task import Task, TaskDependency, task_set_version
+from schemas.task import task_schema, tasks_schema, archived_tasks_schema
+from services.gemini_service import analyze_task_importance_async
+from services.optimizer import OPTIMIZER_MODES, lion_optimization, priority_label
+from services.task_analyzer import analyze_task_importance
+from services.score_scheduler import score_scheduler, refresh_stale_scores
+from services.search import search_tasks
+from services.concurrency import AsyncSingleFlight
+from services.snapshot import TaskSnapshot
+from services.task_stats import task_stats, record_snapshot_changes
+from services.archiver import archived_tasks_page, restore_task
+from services.dependency_graph import dependency_graph, DependencyCycleError
+from services import wire_format
+from routes.tasks import (
+    parse_deadline, analysis_payload, get_rate_limiter, search_arguments, search_payload, rescore_later
+)
+
+async_tasks_bp = Blueprint('async_tasks', __name__)
+
+def get_session():
+    return current_app.extensions['async_session']()
+
+async def analyze_importance(task):
+    """Score a task with the analyzer selected by the ANALYZER_BACKEND setting"""
+    if current_app.config.get('ANALYZER_BACKEND') == 'gemini':
+        return await analyze_task_importance_async(task, current_app.extensions['http_client'])
+    # The built-in analyzer is a handful of string checks, cheap enough to run inline
+    return analyze_task_importance(task)
+
+class TaskNotFound(Exception):
+    pass
+
+async def get_task_or_404(session, task_id):
+    task = await session.get(Task, task_id)
+    if task is None:
+        raise TaskNotFound()
+    return task
+
+def rate_limited(name):
+    """Reject the request with 429 once the client has used up its token bucket for `name`"""
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            allowed, retry_after = get_rate_limiter(current_app, name).acquire(request.remote_addr)
+            if not allowed:
+                response = jsonify({'error': 'Rate limit exceeded, please retry later'})
+                response.headers['Retry-After'] = str(math.ceil(retry_after))
+                return response, 429
+            return await view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# Concurrent identical optimize/analyze requests share one computation
+optimize_flight = AsyncSingleFlight()
+analyze_flight = AsyncSingleFlight()
+
+def task_list_response(tasks):
+    """A task list in the wire format the client negotiated (see services.wire_format)"""
+    return wire_format.task_list_response(current_app, request, tasks)
+
+@async_tasks_bp.after_request
+async def compress_response(response):
+    """gzip/brotli-compress large responses for clients that accept it"""
+    if not wire_format.compressible(response):
+        return response
+    return wire_format.compress_response(
+        response, await response.get_data(), request.accept_encodings,
+        current_app.config.get('COMPRESS_MIN_BYTES', 1024)
+    )
+
+@async_tasks_bp.before_request
+async def load_dependency_graph():
+    """Build (or periodically rebuild) the dependency graph before anything analyzes or optimizes tasks"""
+    max_age = current_app.config.get('DEPENDENCY_RELOAD_SECONDS', 300)
+    engine = current_app.extensions['sync_engine']
+    try:
+        if not dependency_graph.loaded:
+            # Nothing to serve from yet: wait for the first build, on a worker thread so
+            # the event loop keeps serving other requests
+            loop = asyncio.get_running_loop()
+            rescore_later(await loop.run_in_executor(None, dependency_graph.reload, engine, max_age))
+        elif dependency_graph.needs_reload(max_age):
+            dependency_graph.reload_in_background(engine, max_age)
+        rescore_later(dependency_graph.take_reloaded_changes())
+    except Exception as e:
+        print(f"Error loading task dependencies: {str(e)}")
+
+@async_tasks_bp.before_request
+async def refresh_scores():
+    """Re-score tasks whose deadline/age bucket changed since they were last analyzed"""
+    # Bucket transitions describe the built-in analyzer; Gemini scores are left alone
+    if current_app.config.get('ANALYZER_BACKEND', 'builtin') != 'builtin':
+        return
+    try:
+        async with get_session() as session:
+            await session.run_sync(refresh_stale_scores)
+    except Exception as e:
+        print(f"Error refreshing stale scores: {str(e)}")
+
+@async_tasks_bp.errorhandler(TaskNotFound)
+async def task_not_found(error):
+    return jsonify({'error': 'Task not found'}), 404
+
+@async_tasks_bp.route('/tasks', methods=['GET'])
+async def get_tasks():
+    async with get_session() as session:
+        tasks = (await session.scalars(select(Task))).all()
+        return task_list_response(tasks)
+
+@async_tasks_bp.route('/tasks/next', methods=['GET'])
+async def get_next_tasks():
+    k = request.args.get('k', default=5, type=int)
+    if k is None or k < 1:
+        return jsonify({'error': 'k must be a positive integer'}), 400
+    k = min(k, 100)
+
+    async with get_session() as session:
+        tasks = (await session.scalars(
+            select(Task).filter_by(completed=False).order_by(Task.rank_score.desc()).limit(k)
+        )).all()
+        return task_list_response(tasks)
+
+@async_tasks_bp.route('/tasks/stats', methods=['GET'])
+async def get_task_stats():
+    if task_stats.needs_reconcile(current_app.config.get('STATS_RECONCILE_SECONDS', 300)):
+        async with get_session() as session:
+            await session.run_sync(task_stats.reconcile)
+    return jsonify(task_stats.summary())
+
+@async_tasks_bp.route('/tasks/archive', methods=['GET'])
+async def get_archived_tasks():
+    limit = min(max(request.args.get('limit', default=50, type=int), 1), 200)
+    offset = max(request.args.get('offset', default=0, type=int), 0)
+
+    async with get_session() as session:
+        tasks, total = await session.run_sync(archived_tasks_page, limit, offset)
+        return jsonify({
+            'results': archived_tasks_schema.dump(tasks),
+            'total': total,
+            'limit': limit,
+            'offset': offset
+        })
+
+@async_tasks_bp.route('/tasks/search', methods=['GET'])
+async def search():
+    """Ranked full-text search over task titles and descriptions"""
+    try:
+        arguments = search_arguments(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    async with get_session() as session:
+        results, total = await session.run_sync(lambda sync_session: search_tasks(sync_session, **arguments))
+        return jsonify(search_payload(results, total, arguments['limit'], arguments['offset']))
+
+@async_tasks_bp.route('/tasks', methods=['POST'])
+async def create_task():
+    async with get_session() as session:
+        try:
+            data = await request.get_json()
+            deadline = None
+            if data.get('deadline'):
+                try:
+                    deadline = parse_deadline(data['deadline'])
+                except ValueError:
+                    return jsonify({'error': 'Invalid deadline format'}), 400
+
+            new_task = Task(
+                title=data['title'],
+                description=data.get('description', ''),
+                deadline=deadline,
+                priority=data.get('priority', 'medium'),
+                completed=data.get('completed', False),
+                created_at=datetime.utcnow()
+            )
+
+            # Analyze the task importance immediately on creation
+            try:
+                importance_score, explanation = await analyze_importance(new_task)
+                new_task.importance_score = importance_score
+                new_task.importance_explanation = explanation
+                new_task.analyzed_at = datetime.utcnow()
+            except Exception as e:
+                print(f"Error analyzing new task: {str(e)}")
+
+            session.add(new_task)
+            await session.commit()
+            score_scheduler.schedule(new_task)
+            return jsonify(task_schema.dump(new_task))
+        except Exception as e:
+            await session.rollback()
+            return jsonify({'error': str(e)}), 400
+
+@async_tasks_bp.route('/tasks/<int:task_id>', methods=['PUT'])
+async def update_task(task_id):
+    async with get_session() as session:
+        try:
+            data = await request.get_json()
+            task = await session.get(Task, task_id)
+            restored = False
+            if task is None and data.get('completed') is False:
+                # Un-completing an archived task moves it back into the hot table
+                task = await session.run_sync(restore_task, task_id)
+                restored = task is not None
+            if task is None:
+                raise TaskNotFound()
+            content_changed = False
+
+            if 'title' in data and task.title != data['title']:
+                task.title = data['title']
+                content_changed = True
+
+            if 'description' in data and task.description != data['description']:
+                task.description = data['description']
+                content_changed = True
+
+            if 'completed' in data:
+                task.completed = data['completed']
+
+            if 'priority' in data:
+                task.priority = data['priority']
+
+            if 'deadline' in data:
+                new_deadline = parse_deadline(data['deadline']) if data['deadline'] else None
+                if task.deadline != new_deadline:
+                    task.deadline = new_deadline
+                    content_changed = True
+
+            # Re-analyze importance if the task content has changed
+            if content_changed:
+                try:
+                    importance_score, explanation = await analyze_importance(task)
+                    task.importance_score = importance_score
+                    task.importance_explanation = explanation
+                    task.analyzed_at = datetime.utcnow()
+                except Exception as e:
+                    print(f"Error re-analyzing task: {str(e)}")
+
+            await session.commit()
+            score_scheduler.schedule(task)
+            if restored:
+                rescore_later(await session.run_sync(dependency_graph.restore_task, task))
+            rescore_later(dependency_graph.update_task(task))
+            return jsonify(task_schema.dump(task))
+        except TaskNotFound:
+            raise
+        except Exception as e:
+            await session.rollback()
+            return jsonify({'error': str(e)}), 400
+
+@async_tasks_bp.route('/tasks/<int:task_id>', methods=['DELETE'])
+async def delete_task(task_id):
+    async with get_session() as session:
+        try:
+            task = await get_task_or_404(session, task_id)
+            await session.delete(task)
+            await session.execute(
+                delete(TaskDependency).where(
+                    or_(TaskDependency.task_id == task_id, TaskDependency.depends_on_id == task_id)
+                ),
+                execution_options={'synchronize_session': False}
+            )
+            await session.commit()
+            score_scheduler.unschedule(task_id)
+            rescore_later(dependency_graph.remove_task(task_id))
+            return jsonify({'message': 'Task deleted successfully'})
+        except TaskNotFound:
+            raise
+        except Exception as e:
+            await session.rollback()
+            return jsonify({'error': str(e)}), 400
+
+@async_tasks_bp.route('/tasks/blocked', methods=['GET'])
+async def get_blocked_tasks():
+    limit = min(max(request.args.get('limit', default=50, type=int), 1), 200)
+    offset = max(request.args.get('offset', default=0, type=int), 0)
+
+    blocked_ids = dependency_graph.blocked_ids()
+    page_ids = blocked_ids[offset:offset + limit]
+    async with get_session() as session:
+        tasks = (await session.scalars(select(Task).where(Task.id.in_(page_ids)).order_by(Task.id))).all()
+        return jsonify({
+            'results': tasks_schema.dump(tasks),
+            'total': len(blocked_ids),
+            'limit': limit,
+            'offset': offset
+        })
+
+@async_tasks_bp.route('/tasks/<int:task_id>/dependencies', methods=['GET'])
+async def get_dependencies(task_id):
+    async with get_session() as session:
+        task = await get_task_or_404(session, task_id)
+        return jsonify(dependency_graph.describe(task))
+
+@async_tasks_bp.route('/tasks/<int:task_id>/dependencies', methods=['POST'])
+async def add_dependency(task_id):
+    data = await request.get_json() or {}
+    blocker_id = data.get('depends_on')
+    if not isinstance(blocker_id, int):
+        return jsonify({'error': 'depends_on must be a task id'}), 400
+
+    async with get_session() as session:
+        task = await get_task_or_404(session, task_id)
+        blocker = await get_task_or_404(session, blocker_id)
+        if await session.get(TaskDependency, (task_id, blocker_id)) is not None:
+            return jsonify(dependency_graph.describe(task))
+
+        # Update the graph first: it rejects cycles and keeps the reverse edge out until we commit
+        try:
+            changed = dependency_graph.add_dependency(task, blocker)
+        except DependencyCycleError as e:
+            return jsonify({'error': str(e)}), 409
+
+        try:
+            session.add(TaskDependency(task_id=task_id, depends_on_id=blocker_id))
+            await session.flush()
+            await session.run_sync(dependency_graph.verify_acyclic, task_id, blocker_id)
+            await session.commit()
+        except DependencyCycleError as e:
+            await session.rollback()
+            dependency_graph.remove_dependency(task_id, blocker_id)
+            return jsonify({'error': str(e)}), 409
+        except Exception as e:
+            await session.rollback()
+            dependency_graph.remove_dependency(task_id, blocker_id)
+            return jsonify({'error': str(e)}), 400
+
+        rescore_later(changed)
+        return jsonify(dependency_graph.describe(task)), 201
+
+@async_tasks_bp.route('/tasks/<int:task_id>/dependencies/<int:blocker_id>', methods=['DELETE'])
+async def remove_dependency(task_id, blocker_id):
+    async with get_session() as session:
+        try:
+            dependency = await session.get(TaskDependency, (task_id, blocker_id))
+            if dependency is None:
+                return jsonify({'error': 'Dependency not found'}), 404
+            await session.delete(dependency)
+            await session.commit()
+            rescore_later(dependency_graph.remove_dependency(task_id, blocker_id))
+            return jsonify({'message': 'Dependency removed successfully'})
+        except Exception as e:
+            await session.rollback()
+            return jsonify({'error': str(e)}), 400
+
+@async_tasks_bp.route('/tasks/optimize', methods=['POST'])
+@rate_limited('optimize')
+async def optimize_tasks():
+    mode = request.args.get('mode', current_app.config.get('OPTIMIZER_MODE', 'lion'))
+    if mode not in OPTIMIZER_MODES:
+        return jsonify({'error': f"Mode must be one of: {', '.join(OPTIMIZER_MODES)}"}), 400
+
+    # Requests that arrive while the same task set is being optimized reuse that result
+    payload, status = await optimize_flight.do(('optimize', mode, task_set_version()), lambda: run_optimization(mode))
+    if isinstance(payload, TaskSnapshot):
+        return task_list_response(payload)
+    return jsonify(payload), status
+
+async def run_optimization(mode):
+    """
+    Optimize the pending tasks and commit their priorities.
+    Returns (optimized TaskSnapshot, 200) or (error/message payload, status).
+    """
+    async with get_session() as session:
+        try:
+            # Columnar snapshot instead of ORM objects: the optimizer only reads a few fields
+            result = await session.execute(TaskSnapshot.select_statement(completed=False))
+            snapshot = TaskSnapshot.from_rows(result.all())
+            if not snapshot:
+                return {'message': 'No pending tasks to optimize'}, 200
+
+            # The optimizer is CPU-bound; keep it off the event loop
+            loop = asyncio.get_running_loop()
+            priorities = await loop.run_in_executor(None, partial(lion_optimization, snapshot, mode=mode))
+
+            for index, priority_value in enumerate(priorities):
+                priority_str = priority_label(priority_value)
+                if priority_str:
+                    snapshot.set(index, 'priority', priority_str)
+
+            # Write back only the rows whose priority or importance changed
+            changed_rows = snapshot.changed_rows()
+            if changed_rows:
+                # The bulk UPDATE skips the flush, so report the priority changes to the stats
+                record_snapshot_changes(session, snapshot)
+                await session.execute(update(Task), changed_rows, execution_options={'task_stats_recorded': True})
+            await session.commit()
+            return snapshot, 200
+        except Exception as e:
+            await session.rollback()
+            return {'error': str(e)}, 400
+
+@async_tasks_bp.route('/tasks/<int:task_id>/analyze', methods=['GET'])
+@rate_limited('analyze')
+async def analyze_task(task_id):
+    """Analyze a specific task and return its importance"""
+    payload, status = await analyze_flight.do(('analyze', task_id, task_set_version()), lambda: run_analysis(task_id))
+    return jsonify(payload), status
+
+async def run_analysis(task_id):
+    """Analyze a task and store its importance. Returns (payload, status)."""
+    async with get_session() as session:
+        task = await session.get(Task, task_id)
+        if task is None:
+            return {'error': 'Task not found'}, 404
+
+        try:
+            importance_score, explanation = await analyze_importance(task)
+
+            task.importance_score = importance_score
+            task.importance_explanation = explanation
+            task.analyzed_at = datetime.utcnow()
+            await session.commit()
+            score_scheduler.schedule(task)
+
+            return analysis_payload(task, importance_score, explanation), 200
+        except Exception as e:
+            await session.rollback()
+            return {'error': str(e)}, 400
@@ -1,17 +1,211 @@
-from flask import Blueprint, request, jsonify
-from datetime import datetime
-from models.task import Task
+from flask import Blueprint, current_app, request, jsonify
+from datetime import datetime, timezone
+from functools import wraps
+import math
+from sqlalchemy import or_, update
+from models.task import Task, TaskDependency, task_set_version
 from extensions import db
-from schemas.task import task_schema, tasks_schema
-from services.optimizer import lion_optimization
+from schemas.task import task_schema, tasks_schema, archived_tasks_schema
+from services.optimizer import OPTIMIZER_MODES, lion_optimization, priority_label
 from services.task_analyzer import analyze_task_importance
+from services import gemini_service
+from services.score_scheduler import score_scheduler, refresh_stale_scores
+from services.search import search_tasks
+from services.concurrency import SingleFlight, TokenBucketLimiter
+from services.snapshot import TaskSnapshot
+from services.task_stats import task_stats, record_snapshot_changes
+from services.archiver import archived_tasks_page, restore_task
+from services.dependency_graph import dependency_graph, DependencyCycleError
+from services import wire_format
 
 tasks_bp = Blueprint('tasks', __name__)
 
+def parse_deadline(value):
+    """Parse an ISO deadline into the naive UTC datetime the analyzers compare against"""
+    deadline = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if deadline.tzinfo is not None:
+        deadline = deadline.astimezone(timezone.utc).replace(tzinfo=None)
+    return deadline
+
+def analyze_importance(task):
+    """Score a task with the analyzer selected by the ANALYZER_BACKEND setting"""
+    if current_app.config.get('ANALYZER_BACKEND') == 'gemini':
+        return gemini_service.analyze_task_importance(task)
+    return analyze_task_importance(task)
+
+def analysis_payload(task, importance_score, explanation):
+    """Build the enhanced analysis response shared by the WSGI and ASGI analyze endpoints"""
+    # Determine importance category for better UI display
+    importance_category = 'medium'
+    if importance_score >= 0.7:
+        importance_category = 'high'
+    elif importance_score <= 0.4:
+        importance_category = 'low'
+        
+    # Create visual indicators
+    importance_percentage = int(importance_score * 100)
+    
+    # Generate actionable insights based on the score
+    insights = []
+    if importance_score >= 0.7:
+        insights.append("Consider prioritizing this task above others")
+    if task.deadline and (task.deadline - datetime.utcnow()).total_seconds() < 86400 * 3:  # 3 days
+        insights.append("Task deadline is approaching soon")
+    if importance_score <= 0.3:
+        insights.append("This task could potentially be delegated or scheduled for later")
+    
+    # Return the enhanced analysis results
+    return {
+        'task_id': task.id,
+        'title': task.title,
+        'importance_score': importance_score,
+        'importance_percentage': importance_percentage,
+        'importance_category': importance_category,
+        'explanation': explanation,
+        'insights': insights,
+        'analysis_time': datetime.utcnow().isoformat()
+    }
+
+def task_list_response(tasks):
+    """A task list in the wire format the client negotiated (see services.wire_format)"""
+    return wire_format.task_list_response(current_app, request, tasks)
+
+@tasks_bp.after_request
+def compress_response(response):
+    """gzip/brotli-compress large responses for clients that accept it"""
+    if not wire_format.compressible(response):
+        return response
+    return wire_format.compress_response(
+        response, response.get_data(), request.accept_encodings, current_app.config.get('COMPRESS_MIN_BYTES', 1024)
+    )
+
+def rescore_later(task_ids):
+    """Have the score refresh pick up tasks whose inherited deadline just changed"""
+    if task_ids:
+        score_scheduler.requeue(task_ids, datetime.min)
+
+@tasks_bp.before_request
+def load_dependency_graph():
+    """Build (or periodically rebuild) the dependency graph before anything analyzes or optimizes tasks"""
+    max_age = current_app.config.get('DEPENDENCY_RELOAD_SECONDS', 300)
+    try:
+        if not dependency_graph.loaded:
+            # Nothing to serve from yet; this request waits for the first build
+            rescore_later(dependency_graph.ensure_loaded(db.session, max_age))
+        elif dependency_graph.needs_reload(max_age):
+            dependency_graph.reload_in_background(db.engine, max_age)
+        rescore_later(dependency_graph.take_reloaded_changes())
+    except Exception as e:
+        print(f"Error loading task dependencies: {str(e)}")
+
+@tasks_bp.before_request
+def refresh_scores():
+    """Re-score tasks whose deadline/age bucket changed since they were last analyzed"""
+    # Bucket transitions describe the built-in analyzer; Gemini scores are left alone
+    if current_app.config.get('ANALYZER_BACKEND', 'builtin') != 'builtin':
+        return
+    try:
+        refresh_stale_scores(db.session)
+    except Exception as e:
+        print(f"Error refreshing stale scores: {str(e)}")
+
 @tasks_bp.route('/tasks', methods=['GET'])
 def get_tasks():
     tasks = Task.query.all()
-    return jsonify(tasks_schema.dump(tasks))
+    return task_list_response(tasks)
+
+@tasks_bp.route('/tasks/next', methods=['GET'])
+def get_next_tasks():
+    """Return the top-k pending tasks, served from the (completed, rank_score) index"""
+    k = request.args.get('k', default=5, type=int)
+    if k is None or k < 1:
+        return jsonify({'error': 'k must be a positive integer'}), 400
+    k = min(k, 100)
+
+    tasks = (
+        Task.query
+        .filter_by(completed=False)
+        .order_by(Task.rank_score.desc())
+        .limit(k)
+        .all()
+    )
+    return task_list_response(tasks)
+
+@tasks_bp.route('/tasks/stats', methods=['GET'])
+def get_task_stats():
+    """Dashboard counters, kept up to date by session events instead of scanning the table"""
+    try:
+        if task_stats.needs_reconcile(current_app.config.get('STATS_RECONCILE_SECONDS', 300)):
+            task_stats.reconcile(db.session)
+        return jsonify(task_stats.summary())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@tasks_bp.route('/tasks/archive', methods=['GET'])
+def get_archived_tasks():
+    """Page through archived (long-completed) tasks, most recently completed first"""
+    limit = min(max(request.args.get('limit', default=50, type=int), 1), 200)
+    offset = max(request.args.get('offset', default=0, type=int), 0)
+
+    tasks, total = archived_tasks_page(db.session, limit, offset)
+    return jsonify({
+        'results': archived_tasks_schema.dump(tasks),
+        'total': total,
+        'limit': limit,
+        'offset': offset
+    })
+
+def search_arguments(args):
+    """
+    Parse the /tasks/search query string shared by the WSGI and ASGI search endpoints.
+    Returns the search_tasks keyword arguments; raises ValueError for invalid input.
+    """
+    query = args.get('q', '').strip()
+    if not query:
+        raise ValueError('Query parameter q is required')
+
+    completed = args.get('completed')
+    if completed is not None:
+        completed = completed.lower() in ('1', 'true', 'yes')
+
+    priority = args.get('priority')
+    if priority is not None and priority not in ('low', 'medium', 'high'):
+        raise ValueError('Priority must be one of: low, medium, high')
+
+    return {
+        'query': query,
+        'completed': completed,
+        'priority': priority,
+        'limit': min(max(args.get('limit', default=20, type=int), 1), 100),
+        'offset': max(args.get('offset', default=0, type=int), 0),
+    }
+
+def search_payload(results, total, limit, offset):
+    """Build the search response shared by the WSGI and ASGI search endpoints"""
+    items = []
+    for task, rank, snippet in results:
+        item = task_schema.dump(task)
+        item['rank'] = rank
+        item['snippet'] = snippet
+        items.append(item)
+
+    return {
+        'results': items,
+        'total': total,
+        'limit': limit,
+        'offset': offset
+    }
+
+@tasks_bp.route('/tasks/search', methods=['GET'])
+def search():
+    """Ranked full-text search over task titles and descriptions"""
+    try:
+        arguments = search_arguments(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    results, total = search_tasks(db.session, **arguments)
+    return jsonify(search_payload(results, total, arguments['limit'], arguments['offset']))
 
 @tasks_bp.route('/tasks', methods=['POST'])
 def create_task():
@@ -20,7 +214,7 @@ def create_task():
         deadline = None
         if data.get('deadline'):
             try:
-                deadline = datetime.fromisoformat(data['deadline'].replace('Z', '+00:00'))
+                deadline = parse_deadline(data['deadline'])
             except ValueError:
                 return jsonify({'error': 'Invalid deadline format'}), 400
 
@@ -29,19 +223,22 @@ def create_task():
             description=data.get('description', ''),
             deadline=deadline,
             priority=data.get('priority', 'medium'),
-            completed=data.get('completed', False)
+            completed=data.get('completed', False),
+            created_at=datetime.utcnow()
         )
         
         # Analyze the task importance immediately on creation
         try:
-            importance_score, explanation = analyze_task_importance(new_task)
+            importance_score, explanation = analyze_importance(new_task)
             new_task.importance_score = importance_score
             new_task.importance_explanation = explanation
+            new_task.analyzed_at = datetime.utcnow()
         except Exception as e:
             print(f"Error analyzing new task: {str(e)}")
         
         db.session.add(new_task)
         db.session.commit()
+        score_scheduler.schedule(new_task)
         return task_schema.jsonify(new_task)
     except Exception as e:
         db.session.rollback()
@@ -50,8 +247,15 @@ def create_task():
 @tasks_bp.route('/tasks/<int:task_id>', methods=['PUT'])
 def update_task(task_id):
     try:
-        task = Task.query.get_or_404(task_id)
         data = request.json
+        task = db.session.get(Task, task_id)
+        restored = False
+        if task is None and data.get('completed') is False:
+            # Un-completing an archived task moves it back into the hot table
+            task = restore_task(db.session, task_id)
+            restored = task is not None
+        if task is None:
+            return jsonify({'error': 'Task not found'}), 404
         content_changed = False
         
         if 'title' in data:
@@ -71,7 +275,7 @@ def update_task(task_id):
             task.priority = data['priority']
             
         if 'deadline' in data:
-            new_deadline = datetime.fromisoformat(data['deadline'].replace('Z', '+00:00')) if data['deadline'] else None
+            new_deadline = parse_deadline(data['deadline']) if data['deadline'] else None
             if task.deadline != new_deadline:
                 task.deadline = new_deadline
                 content_changed = True
@@ -79,13 +283,18 @@ def update_task(task_id):
         # Re-analyze importance if the task content has changed
         if content_changed:
             try:
-                importance_score, explanation = analyze_task_importance(task)
+                importance_score, explanation = analyze_importance(task)
                 task.importance_score = importance_score
                 task.importance_explanation = explanation
+                task.analyzed_at = datetime.utcnow()
             except Exception as e:
                 print(f"Error re-analyzing task: {str(e)}")
         
         db.session.commit()
+        score_scheduler.schedule(task)
+        if restored:
+            rescore_later(dependency_graph.restore_task(db.session, task))
+        rescore_later(dependency_graph.update_task(task))
         return task_schema.jsonify(task)
     except Exception as e:
         db.session.rollback()
@@ -96,89 +305,190 @@ def delete_task(task_id):
     try:
         task = Task.query.get_or_404(task_id)
         db.session.delete(task)
+        TaskDependency.query.filter(
+            or_(TaskDependency.task_id == task_id, TaskDependency.depends_on_id == task_id)
+        ).delete(synchronize_session=False)
         db.session.commit()
+        score_scheduler.unschedule(task_id)
+        rescore_later(dependency_graph.remove_task(task_id))
         return jsonify({'message': 'Task deleted successfully'})
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
 
+@tasks_bp.route('/tasks/blocked', methods=['GET'])
+def get_blocked_tasks():
+    """Pending tasks that still wait on at least one pending dependency"""
+    limit = min(max(request.args.get('limit', default=50, type=int), 1), 200)
+    offset = max(request.args.get('offset', default=0, type=int), 0)
+
+    blocked_ids = dependency_graph.blocked_ids()
+    page_ids = blocked_ids[offset:offset + limit]
+    tasks = Task.query.filter(Task.id.in_(page_ids)).order_by(Task.id).all() if page_ids else []
+    return jsonify({
+        'results': tasks_schema.dump(tasks),
+        'total': len(blocked_ids),
+        'limit': limit,
+        'offset': offset
+    })
+
+@tasks_bp.route('/tasks/<int:task_id>/dependencies', methods=['GET'])
+def get_dependencies(task_id):
+    task = db.session.get(Task, task_id)
+    if task is None:
+        return jsonify({'error': 'Task not found'}), 404
+    return jsonify(dependency_graph.describe(task))
+
+@tasks_bp.route('/tasks/<int:task_id>/dependencies', methods=['POST'])
+def add_dependency(task_id):
+    """Make a task wait for another one: {"depends_on": <task id>}"""
+    data = request.json or {}
+    blocker_id = data.get('depends_on')
+    if not isinstance(blocker_id, int):
+        return jsonify({'error': 'depends_on must be a task id'}), 400
+
+    task = db.session.get(Task, task_id)
+    blocker = db.session.get(Task, blocker_id)
+    if task is None or blocker is None:
+        return jsonify({'error': 'Task not found'}), 404
+    if db.session.get(TaskDependency, (task_id, blocker_id)) is not None:
+        return jsonify(dependency_graph.describe(task))
+
+    # Update the graph first: it rejects cycles, and holding the edge there keeps
+    # concurrent requests from sneaking in the reverse edge before we commit
+    try:
+        changed = dependency_graph.add_dependency(task, blocker)
+    except DependencyCycleError as e:
+        return jsonify({'error': str(e)}), 409
+
+    try:
+        db.session.add(TaskDependency(task_id=task_id, depends_on_id=blocker_id))
+        db.session.flush()
+        dependency_graph.verify_acyclic(db.session, task_id, blocker_id)
+        db.session.commit()
+    except DependencyCycleError as e:
+        db.session.rollback()
+        dependency_graph.remove_dependency(task_id, blocker_id)
+        return jsonify({'error': str(e)}), 409
+    except Exception as e:
+        db.session.rollback()
+        dependency_graph.remove_dependency(task_id, blocker_id)
+        return jsonify({'error': str(e)}), 400
+
+    rescore_later(changed)
+    return jsonify(dependency_graph.describe(task)), 201
+
+@tasks_bp.route('/tasks/<int:task_id>/dependencies/<int:blocker_id>', methods=['DELETE'])
+def remove_dependency(task_id, blocker_id):
+    try:
+        dependency = db.session.get(TaskDependency, (task_id, blocker_id))
+        if dependency is None:
+            return jsonify({'error': 'Dependency not found'}), 404
+        db.session.delete(dependency)
+        db.session.commit()
+        rescore_later(dependency_graph.remove_dependency(task_id, blocker_id))
+        return jsonify({'message': 'Dependency removed successfully'})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+
+def rate_limited(name):
+    """Reject the request with 429 once the client has used up its token bucket for `name`"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            allowed, retry_after = get_rate_limiter(current_app, name).acquire(request.remote_addr)
+            if not allowed:
+                response = jsonify({'error': 'Rate limit exceeded, please retry later'})
+                response.headers['Retry-After'] = str(math.ceil(retry_after))
+                return response, 429
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def get_rate_limiter(app, name):
+    """Token bucket limiter for an endpoint, created from the app config on first use"""
+    limiters = app.extensions.setdefault('rate_limiters', {})
+    if name not in limiters:
+        limiters[name] = TokenBucketLimiter(
+            app.config.get('RATE_LIMIT_CAPACITY', 10),
+            app.config.get('RATE_LIMIT_REFILL_PER_SECOND', 0.5)
+        )
+    return limiters[name]
+
+# Concurrent identical optimize/analyze requests share one computation
+optimize_flight = SingleFlight()
+analyze_flight = SingleFlight()
+
 @tasks_bp.route('/tasks/optimize', methods=['POST'])
+@rate_limited('optimize')
 def optimize_tasks():
+    mode = request.args.get('mode', current_app.config.get('OPTIMIZER_MODE', 'lion'))
+    if mode not in OPTIMIZER_MODES:
+        return jsonify({'error': f"Mode must be one of: {', '.join(OPTIMIZER_MODES)}"}), 400
+
+    # Requests that arrive while the same task set is being optimized reuse that result
+    payload, status = optimize_flight.do(('optimize', mode, task_set_version()), lambda: run_optimization(mode))
+    if isinstance(payload, TaskSnapshot):
+        return task_list_response(payload)
+    return jsonify(payload), status
+
+def run_optimization(mode):
+    """
+    Optimize the pending tasks and commit their priorities.
+    Returns (optimized TaskSnapshot, 200) or (error/message payload, status).
+    """
     try:
-        tasks = Task.query.filter_by(completed=False).all()
-        if not tasks:
-            return jsonify({'message': 'No pending tasks to optimize'})
+        # Columnar snapshot instead of ORM objects: the optimizer only reads a few fields
+        snapshot = TaskSnapshot.load(db.session, completed=False)
+        if not snapshot:
+            return {'message': 'No pending tasks to optimize'}, 200
         
-        # Run Lion Optimization Algorithm
-        priorities = lion_optimization(tasks)
+        # Run Lion Optimization Algorithm (or its exact/seeded variants)
+        priorities = lion_optimization(snapshot, mode=mode)
         print(f"Calculated priorities: {priorities}")  # Debug log
         
-        # Map numerical priorities to string-based priorities
-        priority_mapping = {
-            (0.0, 0.4): 'low',
-            (0.4, 0.7): 'medium',
-            (0.7, 1.0): 'high'
-        }
-        
         # Update task priorities
-        for task, priority_value in zip(tasks, priorities):
-            print(f"Task '{task.title}' priority value: {priority_value}")  # Debug log
-            for (lower, upper), priority_str in priority_mapping.items():
-                if lower <= priority_value <= upper:
-                    print(f"Setting task '{task.title}' to priority: {priority_str}")  # Debug log
-                    task.priority = priority_str
-                    break
+        for index, priority_value in enumerate(priorities):
+            priority_str = priority_label(priority_value)
+            if priority_str:
+                snapshot.set(index, 'priority', priority_str)
         
+        # Write back only the rows whose priority or importance changed
+        changed_rows = snapshot.changed_rows()
+        if changed_rows:
+            # The bulk UPDATE skips the flush, so report the priority changes to the stats
+            record_snapshot_changes(db.session, snapshot)
+            db.session.execute(update(Task), changed_rows, execution_options={'task_stats_recorded': True})
         db.session.commit()
-        return jsonify(tasks_schema.dump(tasks))
+        return snapshot, 200
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': str(e)}), 400
+        return {'error': str(e)}, 400
 
 @tasks_bp.route('/tasks/<int:task_id>/analyze', methods=['GET'])
+@rate_limited('analyze')
 def analyze_task(task_id):
     """Analyze a specific task and return its importance"""
+    payload, status = analyze_flight.do(('analyze', task_id, task_set_version()), lambda: run_analysis(task_id))
+    return jsonify(payload), status
+
+def run_analysis(task_id):
+    """Analyze a task and store its importance. Returns (payload, status)."""
     try:
         task = Task.query.get_or_404(task_id)
         
         # Analyze the task
-        importance_score, explanation = analyze_task_importance(task)
+        importance_score, explanation = analyze_importance(task)
         
         # Update the task in the database
         task.importance_score = importance_score
         task.importance_explanation = explanation
+        task.analyzed_at = datetime.utcnow()
         db.session.commit()
+        score_scheduler.schedule(task)
         
-        # Determine importance category for better UI display
-        importance_category = 'medium'
-        if importance_score >= 0.7:
-            importance_category = 'high'
-        elif importance_score <= 0.4:
-            importance_category = 'low'
-            
-        # Create visual indicators
-        importance_percentage = int(importance_score * 100)
-        
-        # Generate actionable insights based on the score
-        insights = []
-        if importance_score >= 0.7:
-            insights.append("Consider prioritizing this task above others")
-        if task.deadline and (task.deadline - datetime.utcnow()).total_seconds() < 86400 * 3:  # 3 days
-            insights.append("Task deadline is approaching soon")
-        if importance_score <= 0.3:
-            insights.append("This task could potentially be delegated or scheduled for later")
-        
-        # Return the enhanced analysis results
-        return jsonify({
-            'task_id': task.id,
-            'title': task.title,
-            'importance_score': importance_score,
-            'importance_percentage': importance_percentage,
-            'importance_category': importance_category,
-            'explanation': explanation,
-            'insights': insights,
-            'analysis_time': datetime.utcnow().isoformat()
-        })
+        return analysis_payload(task, importance_score, explanation), 200
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': str(e)}), 400
\ No newline at end of file
+        return {'error': str(e)}, 400
@@ -1,4 +1,4 @@
-from models.task import Task
+from models.task import Task, ArchivedTask
 from extensions import ma
 from marshmallow import fields, validates, ValidationError, post_load
 
@@ -14,6 +14,7 @@ class TaskSchema(ma.SQLAlchemySchema):
     priority = fields.Str(required=True)
     completed = fields.Bool()  # Remove default here
     created_at = fields.DateTime(dump_only=True)
+    completed_at = fields.DateTime(dump_only=True)
     importance_score = fields.Float(dump_only=True)
     importance_explanation = fields.Str(dump_only=True)
 
@@ -39,5 +40,12 @@ class TaskSchema(ma.SQLAlchemySchema):
             data['description'] = ''
         return data
 
+class ArchivedTaskSchema(TaskSchema):
+    class Meta:
+        model = ArchivedTask
+
+    archived_at = fields.DateTime(dump_only=True)
+
 task_schema = TaskSchema()
-tasks_schema = TaskSchema(many=True) 
\ No newline at end of file
+tasks_schema = TaskSchema(many=True)
+archived_tasks_schema = ArchivedTaskSchema(many=True) 
\ No newline at end of file
@@ -0,0 +1,188 @@
+"""
+Hot/cold storage for completed tasks.
+
+Users mostly look at open work, yet every scan of the task table that isn't
+served by an index pays for the whole history of completed tasks. The archiver
+moves tasks completed more than ARCHIVE_AFTER_DAYS ago into the archived_task
+table, one small batch per transaction so the SQLite write lock is only held
+briefly. Un-completing an archived task moves it back into the hot table, along
+with the dependencies it had.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, literal, select
+
+from extensions import db
+from models.task import Task, ArchivedTask, ARCHIVED_FIELDS
+from services.dependency_graph import dependency_graph
+from services.task_stats import record_archived_changes, record_task_changes
+
+
+def archive_batch(session, older_than, batch_size=500):
+    """Move up to `batch_size` tasks completed before `older_than` into the archive and commit"""
+    task = Task.__table__
+    now = datetime.utcnow()
+
+    rows = session.execute(
+        select(task.c.id, task.c.priority, task.c.deadline)
+        .where(task.c.completed == True, task.c.completed_at < older_than)  # noqa: E712
+        .order_by(task.c.completed_at)
+        .limit(batch_size)
+    ).all()
+    if not rows:
+        return 0
+
+    ids = [row.id for row in rows]
+    session.execute(
+        ArchivedTask.__table__.insert().from_select(
+            ARCHIVED_FIELDS + ('archived_at',),
+            select(*(task.c[name] for name in ARCHIVED_FIELDS), literal(now)).where(task.c.id.in_(ids))
+        )
+    )
+    # The bulk statements skip the flush, so report the moved tasks to the stats
+    record_task_changes(session, [((True, row.priority or 'medium', row.deadline), None) for row in rows])
+    record_archived_changes(session, len(rows))
+    session.execute(
+        delete(Task).where(Task.id.in_(ids)),
+        execution_options={'synchronize_session': False, 'task_stats_recorded': True}
+    )
+    session.commit()
+    # Completed tasks neither block nor wait on anything, so the graph forgets them. Their
+    # task_dependency rows stay behind for restore_task; graph rebuilds skip them meanwhile.
+    for task_id in ids:
+        dependency_graph.remove_task(task_id)
+    return len(rows)
+
+
+def archive_completed_tasks(session, older_than, batch_size=500, pause=0.05):
+    """
+    Archive every task completed before `older_than`, `batch_size` tasks per transaction,
+    sleeping `pause` seconds between batches so requests get a turn at the database.
+    Returns the number of archived tasks.
+    """
+    archived = 0
+    while True:
+        try:
+            moved = archive_batch(session, older_than, batch_size)
+        except Exception:
+            session.rollback()
+            raise
+        archived += moved
+        if moved < batch_size:
+            return archived
+        time.sleep(pause)
+
+
+def restore_task(session, task_id):
+    """
+    Move an archived task back into the hot table as a pending task.
+    Returns the restored Task (added to the session, not committed) or None if it isn't archived.
+    Its dependencies never left the task_dependency table; after committing, hand the task to
+    dependency_graph.restore_task to put them back into the graph.
+    """
+    archived = session.get(ArchivedTask, task_id)
+    if archived is None:
+        return None
+
+    task = Task(**{name: getattr(archived, name) for name in ARCHIVED_FIELDS})
+    task.completed = False
+    session.delete(archived)
+    session.add(task)
+    return task
+
+
+def archived_tasks_page(session, limit, offset):
+    """Archived tasks, most recently completed first. Returns (tasks, total)."""
+    total = session.execute(select(func.count()).select_from(ArchivedTask)).scalar()
+    tasks = session.scalars(
+        select(ArchivedTask)
+        .order_by(ArchivedTask.completed_at.desc(), ArchivedTask.id.desc())
+        .limit(limit)
+        .offset(offset)
+    ).all()
+    return tasks, total
+
+
+def archive_cutoff(config, now=None):
+    """Completion time before which tasks are archived, or None if archival is disabled"""
+    after_days = config.get('ARCHIVE_AFTER_DAYS', 30)
+    if after_days <= 0:
+        return None
+    return (now or datetime.utcnow()) - timedelta(days=after_days)
+
+
+def archiver_enabled(config):
+    """Whether the server process should archive periodically"""
+    return (
+        config.get('RUN_ARCHIVER', True)
+        and config.get('ARCHIVE_INTERVAL_SECONDS', 3600) > 0
+        and archive_cutoff(config) is not None
+    )
+
+
+def start_archiver(app):
+    """Archive old completed tasks every ARCHIVE_INTERVAL_SECONDS on a daemon thread"""
+    if not archiver_enabled(app.config):
+        return None
+    interval = app.config.get('ARCHIVE_INTERVAL_SECONDS', 3600)
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                with app.app_context():
+                    archived = archive_completed_tasks(
+                        db.session, archive_cutoff(app.config), app.config.get('ARCHIVE_BATCH_SIZE', 500)
+                    )
+                if archived:
+                    print(f"Archived {archived} completed task(s)")
+            except Exception as e:
+                print(f"Error archiving completed tasks: {str(e)}")
+
+    thread = threading.Thread(target=run, name='task-archiver', daemon=True)
+    thread.start()
+    return thread
+
+
+async def archive_periodically(app):
+    """asyncio counterpart of start_archiver for the ASGI app; run it as a background task"""
+    import asyncio
+
+    if not archiver_enabled(app.config):
+        return
+
+    interval = app.config.get('ARCHIVE_INTERVAL_SECONDS', 3600)
+    batch_size = app.config.get('ARCHIVE_BATCH_SIZE', 500)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            archived = 0
+            async with app.extensions['async_session']() as session:
+                # Batch by batch, yielding to the event loop between transactions
+                while True:
+                    moved = await session.run_sync(archive_batch, archive_cutoff(app.config), batch_size)
+                    archived += moved
+                    if moved < batch_size:
+                        break
+                    await asyncio.sleep(0.05)
+            if archived:
+                print(f"Archived {archived} completed task(s)")
+        except Exception as e:
+            print(f"Error archiving completed tasks: {str(e)}")
+
+
+if __name__ == '__main__':
+    # Single archival pass, for deployments that run the servers with RUN_ARCHIVER off
+    from app import create_app
+
+    app = create_app()
+    cutoff = archive_cutoff(app.config)
+    if cutoff is None:
+        print("Archival is disabled (ARCHIVE_AFTER_DAYS is 0)")
+    else:
+        with app.app_context():
+            archived = archive_completed_tasks(db.session, cutoff, app.config.get('ARCHIVE_BATCH_SIZE', 500))
+        print(f"Archived {archived} completed task(s)")
@@ -0,0 +1,126 @@
+"""
+Request coalescing and rate limiting for the expensive task endpoints.
+
+SingleFlight lets concurrent callers with the same key share one computation:
+the first caller runs it, the others wait for its result. TokenBucketLimiter
+keeps a token bucket per client so bursts of optimize/analyze requests are
+rejected instead of multiplying CPU cost.
+"""
+
+import threading
+import time
+from functools import partial
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into a single execution (threads)"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """Run fn() unless a call with the same key is in flight; either way return its result"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """Coalesce concurrent calls that share a key into a single execution (asyncio)"""
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, coroutine_fn):
+        """Await coroutine_fn() unless a call with the same key is in flight; either way return its result"""
+        import asyncio
+
+        task = self._calls.get(key)
+        if task is None:
+            # The computation runs as its own task, so cancelling the request that
+            # started it (e.g. a client disconnect) doesn't abort it for the others
+            task = self._calls[key] = asyncio.get_running_loop().create_task(coroutine_fn())
+            task.add_done_callback(partial(self._finished, key))
+        # shield() so a cancelled caller only stops waiting
+        return await asyncio.shield(task)
+
+    def _finished(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Callers re-raise it; mark it retrieved so asyncio doesn't log it as lost when nobody is left waiting
+        if not task.cancelled():
+            task.exception()
+
+
+class TokenBucketLimiter:
+    """
+    Per-client token buckets: each client may burst up to `capacity` requests,
+    refilled at `refill_rate` tokens per second.
+    """
+
+    # Forget clients whose bucket has been full for this long
+    IDLE_SECONDS = 3600
+
+    def __init__(self, capacity, refill_rate):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._buckets = {}  # client -> (tokens, last_refill)
+        self._lock = threading.Lock()
+        self._last_prune = time.monotonic()
+
+    def acquire(self, client):
+        """Take a token for `client`. Returns (allowed, retry_after_seconds)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, last_refill = self._buckets.get(client, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last_refill) * self.refill_rate)
+
+            if tokens >= 1:
+                self._buckets[client] = (tokens - 1, now)
+                allowed, retry_after = True, 0.0
+            else:
+                self._buckets[client] = (tokens, now)
+                allowed = False
+                retry_after = (1 - tokens) / self.refill_rate if self.refill_rate > 0 else float('inf')
+
+            if now - self._last_prune > self.IDLE_SECONDS:
+                self._prune(now)
+
+        return allowed, retry_after
+
+    def _prune(self, now):
+        self._buckets = {
+            client: (tokens, last_refill)
+            for client, (tokens, last_refill) in self._buckets.items()
+            if now - last_refill < self.IDLE_SECONDS
+        }
+        self._last_prune = now
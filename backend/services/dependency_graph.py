@@ -0,0 +1,516 @@
+"""
+Task dependencies with incrementally maintained scheduling data.
+
+Every task is assumed to take TASK_DURATION once it can start. For each task
+that takes part in a dependency the graph keeps:
+
+- a topological order (blockers before the tasks they block), maintained with
+  the Pearce-Kelly algorithm so adding an edge only reorders the affected
+  region and detects cycles on the way;
+- depth: the longest chain of pending blockers in front of the task, which
+  gives its earliest finish (now + (depth + 1) * TASK_DURATION);
+- inherited deadline: the latest finish the pending tasks it blocks impose on
+  it, which together with its own deadline gives its latest finish.
+
+Slack is latest finish minus earliest finish. Edge, deadline and completion
+changes only re-evaluate the tasks downstream (depth) or upstream (inherited
+deadline) of the change, in topological order, so a change costs time
+proportional to the part of the graph it actually affects.
+
+The analyzer and optimizer read the precomputed values; until the graph has
+been loaded they fall back to each task's own deadline.
+
+The graph is per process. With several workers, each one's graph misses the
+edges the others add until it is rebuilt every DEPENDENCY_RELOAD_SECONDS, so a
+new dependency is also checked for cycles against the table before it is
+committed. Those rebuilds run on a background thread while requests keep
+using the current graph; only the very first load makes a request wait.
+"""
+
+import heapq
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, select, text, union
+from sqlalchemy.orm import Session
+
+from models.task import Task, TaskDependency
+
+# Planning estimate for how long a task takes once it is unblocked
+TASK_DURATION = timedelta(days=1)
+
+
+class DependencyCycleError(ValueError):
+    """The dependency would make a task (transitively) depend on itself"""
+
+
+def _earliest(*moments):
+    moments = [moment for moment in moments if moment is not None]
+    return min(moments) if moments else None
+
+
+class DependencyGraph:
+    """In-memory dependency graph with topological order, depth and inherited deadlines"""
+
+    # Attributes replaced wholesale when the graph is rebuilt
+    _STATE = ('_blockers', '_dependents', '_order', '_next_position', '_pending',
+              '_deadline', '_depth', '_inherited', '_blocked')
+
+    def __init__(self, task_duration=TASK_DURATION):
+        self.task_duration = task_duration
+        self._blockers = {}  # task_id -> ids of the tasks it depends on
+        self._dependents = {}  # task_id -> ids of the tasks depending on it
+        self._order = {}  # task_id -> position in the topological order
+        self._next_position = 0
+        self._pending = {}  # task_id -> not completed
+        self._deadline = {}  # task_id -> own deadline
+        self._depth = {}  # task_id -> longest chain of pending blockers
+        self._inherited = {}  # task_id -> latest finish imposed by pending dependents, or None
+        self._blocked = set()  # pending tasks with at least one pending blocker
+        self._changes = 0  # incremental updates applied, to detect ones racing with a rebuild
+        self._loaded = False
+        self._loaded_at = 0.0
+        self._stale = False
+        self._reloading = False  # a background rebuild is running
+        self._reloaded_changes = set()  # ids whose effective deadline a background rebuild changed
+        self._lock = threading.RLock()
+        self._reload_lock = threading.Lock()
+
+    # --- loading -------------------------------------------------------------
+
+    def ensure_loaded(self, session, max_age=None):
+        """
+        Build the graph from the task_dependency table on first use. Other processes
+        change the table too, so it is rebuilt after invalidate() and, given `max_age`,
+        once it is older than that many seconds.
+        Returns the ids of tasks whose effective deadline changed in a rebuild.
+        """
+        if not self.needs_reload(max_age):
+            return set()
+
+        with self._reload_lock:
+            if not self.needs_reload(max_age):
+                return set()
+            with self._lock:
+                changes_before = self._changes
+
+            # Build a separate graph and swap it in, so readers never see a half-built one
+            fresh = DependencyGraph(self.task_duration)
+            fresh._build(session)
+
+            with self._lock:
+                changed = {
+                    task_id for task_id in self._inherited.keys() | fresh._inherited.keys()
+                    if self._inherited.get(task_id) != fresh._inherited.get(task_id)
+                }
+                for name in self._STATE:
+                    setattr(self, name, getattr(fresh, name))
+                # An update that raced with the table read may be missing; reload again next time
+                self._stale = self._changes != changes_before
+                self._loaded = True
+                self._loaded_at = time.monotonic()
+            return changed
+
+    def reload(self, engine, max_age=None):
+        """ensure_loaded() with a session of its own, for use off the request thread / event loop"""
+        with Session(engine) as session:
+            return self.ensure_loaded(session, max_age)
+
+    def reload_in_background(self, engine, max_age=None):
+        """
+        Rebuild the graph on a daemon thread unless a rebuild is already running;
+        the current graph keeps serving meanwhile. Collect the ids whose effective
+        deadline changed with take_reloaded_changes().
+        """
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+
+        def run():
+            try:
+                changed = self.reload(engine, max_age)
+                with self._lock:
+                    self._reloaded_changes |= changed
+            except Exception as e:
+                print(f"Error reloading task dependencies: {str(e)}")
+            finally:
+                with self._lock:
+                    self._reloading = False
+
+        threading.Thread(target=run, name='dependency-graph-reload', daemon=True).start()
+
+    def take_reloaded_changes(self):
+        """Ids whose effective deadline changed in background rebuilds since the last call"""
+        with self._lock:
+            changed, self._reloaded_changes = self._reloaded_changes, set()
+            return changed
+
+    def needs_reload(self, max_age=None):
+        return (
+            not self._loaded or self._stale
+            or (max_age is not None and time.monotonic() - self._loaded_at > max_age)
+        )
+
+    def invalidate(self):
+        """Force a rebuild from the database on next use"""
+        with self._lock:
+            self._stale = True
+
+    def _build(self, session):
+        edges = session.execute(select(TaskDependency.task_id, TaskDependency.depends_on_id)).all()
+        involved = union(select(TaskDependency.task_id), select(TaskDependency.depends_on_id)).subquery()
+        tasks = session.execute(
+            select(Task.id, Task.completed, Task.deadline).where(Task.id.in_(select(involved.c[0])))
+        ).all()
+
+        for task in tasks:
+            self._add_node(task.id, not task.completed, task.deadline)
+        for task_id, blocker_id in edges:
+            # Skip edges left behind by deleted or archived tasks
+            if task_id in self._pending and blocker_id in self._pending:
+                self._blockers[task_id].add(blocker_id)
+                self._dependents[blocker_id].add(task_id)
+
+        order = self._topological_sort()
+        self._order = {task_id: position for position, task_id in enumerate(order)}
+        self._next_position = len(order)
+        for task_id in order:
+            self._depth[task_id] = self._compute_depth(task_id)
+            self._update_blocked(task_id)
+        for task_id in reversed(order):
+            self._inherited[task_id] = self._compute_inherited(task_id)
+
+    def verify_acyclic(self, session, task_id, blocker_id):
+        """
+        Check a dependency that was just added to the session against the table before
+        committing: edges added by other processes may not be in this graph yet.
+        Raises DependencyCycleError (and schedules a rebuild) if it closes a cycle.
+        """
+        cycle = session.execute(text("""
+            WITH RECURSIVE upstream(id) AS (
+                SELECT depends_on_id FROM task_dependency WHERE task_id = :blocker_id
+                UNION
+                SELECT d.depends_on_id FROM task_dependency d JOIN upstream u ON d.task_id = u.id
+            )
+            SELECT 1 FROM upstream WHERE id = :task_id LIMIT 1
+        """), {'task_id': task_id, 'blocker_id': blocker_id}).first()
+        if cycle is not None:
+            self.invalidate()
+            raise DependencyCycleError(
+                f"Task {blocker_id} already depends on task {task_id}; the dependency would create a cycle"
+            )
+
+    def restore_task(self, session, task):
+        """
+        Put back the dependencies of a task just restored from the archive, whose
+        task_dependency rows the archiver kept. Edges to tasks that are still archived
+        stay out of the graph. Returns the ids of tasks whose effective deadline changed.
+        """
+        edges = session.execute(
+            select(TaskDependency.task_id, TaskDependency.depends_on_id)
+            .where(or_(TaskDependency.task_id == task.id, TaskDependency.depends_on_id == task.id))
+        ).all()
+        other_ids = {blocker_id if task_id == task.id else task_id for task_id, blocker_id in edges}
+        tasks = {
+            row.id: row for row in session.execute(
+                select(Task.id, Task.completed, Task.deadline).where(Task.id.in_(other_ids))
+            )
+        } if other_ids else {}
+        tasks[task.id] = task
+
+        changed = set()
+        for task_id, blocker_id in edges:
+            if task_id not in tasks or blocker_id not in tasks:
+                continue
+            try:
+                changed |= self.add_dependency(tasks[task_id], tasks[blocker_id])
+            except DependencyCycleError:
+                # Only possible if the table already holds a cycle; let a rebuild sort it out
+                self.invalidate()
+        return changed
+
+    def reset(self):
+        """Drop all state; the graph is rebuilt from the database on next use"""
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        for state in (self._blockers, self._dependents, self._order, self._pending,
+                      self._deadline, self._depth, self._inherited):
+            state.clear()
+        self._blocked.clear()
+        self._next_position = 0
+        self._loaded = False
+
+    def _topological_sort(self):
+        """Kahn's algorithm; tasks caught in a cycle (from a hand-edited database) go last"""
+        remaining = {task_id: len(blockers) for task_id, blockers in self._blockers.items()}
+        queue = deque(sorted(task_id for task_id, count in remaining.items() if count == 0))
+        order = []
+        while queue:
+            task_id = queue.popleft()
+            order.append(task_id)
+            for dependent in self._dependents[task_id]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    queue.append(dependent)
+        if len(order) < len(remaining):
+            placed = set(order)
+            order.extend(task_id for task_id in remaining if task_id not in placed)
+        return order
+
+    # --- updates -------------------------------------------------------------
+
+    def add_dependency(self, task, blocker):
+        """
+        Record that `task` can't start before `blocker` is completed.
+        Raises DependencyCycleError if `blocker` already depends on `task`.
+        Returns the ids of tasks whose effective deadline changed.
+        """
+        with self._lock:
+            self._changes += 1
+            if task.id == blocker.id:
+                raise DependencyCycleError("A task can't depend on itself")
+            self._add_node(task.id, not task.completed, task.deadline)
+            self._add_node(blocker.id, not blocker.completed, blocker.deadline)
+            if blocker.id in self._blockers[task.id]:
+                return set()
+
+            self._reorder(blocker.id, task.id)
+            self._blockers[task.id].add(blocker.id)
+            self._dependents[blocker.id].add(task.id)
+            self._propagate_depth([task.id])
+            return self._propagate_inherited([blocker.id])
+
+    def remove_dependency(self, task_id, blocker_id):
+        """Drop a dependency. Returns the ids of tasks whose effective deadline changed."""
+        with self._lock:
+            self._changes += 1
+            if blocker_id not in self._blockers.get(task_id, ()):
+                return set()
+            self._blockers[task_id].discard(blocker_id)
+            self._dependents[blocker_id].discard(task_id)
+            self._propagate_depth([task_id])
+            changed = self._propagate_inherited([blocker_id])
+            self._drop_if_isolated(task_id)
+            self._drop_if_isolated(blocker_id)
+            return changed
+
+    def update_task(self, task):
+        """
+        Pick up a changed deadline or completion state.
+        Returns the ids of other tasks whose effective deadline changed.
+        """
+        with self._lock:
+            self._changes += 1
+            if task.id not in self._order:
+                return set()
+            pending = not task.completed
+            pending_changed = pending != self._pending[task.id]
+            deadline_changed = task.deadline != self._deadline[task.id]
+            self._pending[task.id] = pending
+            self._deadline[task.id] = task.deadline
+            self._update_blocked(task.id)
+
+            if pending_changed:
+                self._propagate_depth(self._dependents[task.id])
+            if pending_changed or deadline_changed:
+                return self._propagate_inherited(self._blockers[task.id])
+            return set()
+
+    def remove_task(self, task_id):
+        """Forget a deleted or archived task and its dependencies"""
+        with self._lock:
+            self._changes += 1
+            if task_id not in self._order:
+                return set()
+            blockers = self._blockers.pop(task_id)
+            dependents = self._dependents.pop(task_id)
+            for blocker_id in blockers:
+                self._dependents[blocker_id].discard(task_id)
+            for dependent_id in dependents:
+                self._blockers[dependent_id].discard(task_id)
+            for state in (self._order, self._pending, self._deadline, self._depth, self._inherited):
+                del state[task_id]
+            self._blocked.discard(task_id)
+
+            self._propagate_depth(dependents)
+            changed = self._propagate_inherited(blockers)
+            for neighbour in blockers | dependents:
+                self._drop_if_isolated(neighbour)
+            changed.discard(task_id)
+            return changed
+
+    def _add_node(self, task_id, pending, deadline):
+        if task_id in self._order:
+            return
+        self._order[task_id] = self._next_position
+        self._next_position += 1
+        self._blockers[task_id] = set()
+        self._dependents[task_id] = set()
+        self._pending[task_id] = pending
+        self._deadline[task_id] = deadline
+        self._depth[task_id] = 0
+        self._inherited[task_id] = None
+
+    def _drop_if_isolated(self, task_id):
+        # Tasks without dependencies need no bookkeeping; keeps the graph as small as its edges
+        if task_id in self._order and not self._blockers[task_id] and not self._dependents[task_id]:
+            for state in (self._blockers, self._dependents, self._order, self._pending,
+                          self._deadline, self._depth, self._inherited):
+                del state[task_id]
+            self._blocked.discard(task_id)
+
+    def _reorder(self, blocker_id, task_id):
+        """Pearce-Kelly: restore the topological order for a new edge blocker -> task"""
+        lower, upper = self._order[task_id], self._order[blocker_id]
+        if lower > upper:
+            return  # Already in order; no path task -> blocker can exist
+
+        # Tasks reachable from `task` that currently sit at or before `blocker`
+        forward, stack = {task_id}, [task_id]
+        while stack:
+            for dependent in self._dependents[stack.pop()]:
+                if dependent == blocker_id:
+                    raise DependencyCycleError(
+                        f"Task {blocker_id} already depends on task {task_id}; the dependency would create a cycle"
+                    )
+                if dependent not in forward and self._order[dependent] < upper:
+                    forward.add(dependent)
+                    stack.append(dependent)
+
+        # Tasks that reach `blocker` and currently sit at or after `task`
+        backward, stack = {blocker_id}, [blocker_id]
+        while stack:
+            for blocker in self._blockers[stack.pop()]:
+                if blocker not in backward and self._order[blocker] > lower:
+                    backward.add(blocker)
+                    stack.append(blocker)
+
+        # Move the backward set in front of the forward set, reusing their positions
+        moved = sorted(backward, key=self._order.get) + sorted(forward, key=self._order.get)
+        positions = sorted(self._order[node] for node in moved)
+        for node, position in zip(moved, positions):
+            self._order[node] = position
+
+    def _compute_depth(self, task_id):
+        return max(
+            (self._depth[blocker] + 1 for blocker in self._blockers[task_id] if self._pending[blocker]),
+            default=0
+        )
+
+    def _latest_finish(self, task_id):
+        return _earliest(self._deadline[task_id], self._inherited[task_id])
+
+    def _compute_inherited(self, task_id):
+        return _earliest(*(
+            latest - self.task_duration
+            for latest in (self._latest_finish(dependent)
+                           for dependent in self._dependents[task_id] if self._pending[dependent])
+            if latest is not None
+        ))
+
+    def _update_blocked(self, task_id):
+        if self._pending[task_id] and self._depth[task_id] > 0:
+            self._blocked.add(task_id)
+        else:
+            self._blocked.discard(task_id)
+
+    def _propagate_depth(self, start_ids):
+        """Re-evaluate depth from `start_ids` downstream, in topological order"""
+        heap = [(self._order[task_id], task_id) for task_id in set(start_ids) if task_id in self._order]
+        heapq.heapify(heap)
+        queued = {task_id for _, task_id in heap}
+        while heap:
+            _, task_id = heapq.heappop(heap)
+            depth = self._compute_depth(task_id)
+            if depth == self._depth[task_id]:
+                continue
+            self._depth[task_id] = depth
+            self._update_blocked(task_id)
+            for dependent in self._dependents[task_id]:
+                if dependent not in queued:
+                    queued.add(dependent)
+                    heapq.heappush(heap, (self._order[dependent], dependent))
+
+    def _propagate_inherited(self, start_ids):
+        """Re-evaluate inherited deadlines from `start_ids` upstream; returns the ids that changed"""
+        heap = [(-self._order[task_id], task_id) for task_id in set(start_ids) if task_id in self._order]
+        heapq.heapify(heap)
+        queued = {task_id for _, task_id in heap}
+        changed = set()
+        while heap:
+            _, task_id = heapq.heappop(heap)
+            inherited = self._compute_inherited(task_id)
+            if inherited == self._inherited[task_id]:
+                continue
+            self._inherited[task_id] = inherited
+            changed.add(task_id)
+            for blocker in self._blockers[task_id]:
+                if blocker not in queued:
+                    queued.add(blocker)
+                    heapq.heappush(heap, (-self._order[blocker], blocker))
+        return changed
+
+    # --- queries -------------------------------------------------------------
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def effective_deadline(self, task):
+        """The task's own deadline, or an earlier one inherited from the tasks it blocks"""
+        inherited = self._inherited.get(task.id)
+        return _earliest(task.deadline, inherited)
+
+    def slack_days(self, task_ids, deadlines, now=None):
+        """
+        Slack in days (latest finish - earliest finish) for every task, None where
+        nothing constrains the finish. `deadlines` are the tasks' own deadlines.
+        """
+        now = now or datetime.utcnow()
+        duration_days = self.task_duration.total_seconds() / 86400
+        slack = []
+        with self._lock:
+            for task_id, deadline in zip(task_ids, deadlines):
+                latest = _earliest(deadline, self._inherited.get(task_id))
+                if latest is None:
+                    slack.append(None)
+                    continue
+                depth = self._depth.get(task_id, 0)
+                slack.append((latest - now).total_seconds() / 86400 - (depth + 1) * duration_days)
+        return slack
+
+    def depths(self, task_ids):
+        """Longest chain of pending blockers in front of every task (0 = can start now)"""
+        with self._lock:
+            return [self._depth.get(task_id, 0) for task_id in task_ids]
+
+    def blocked_ids(self):
+        with self._lock:
+            return sorted(self._blocked)
+
+    def describe(self, task, now=None):
+        """Dependencies and scheduling data of one task, for the API"""
+        now = now or datetime.utcnow()
+        with self._lock:
+            depth = self._depth.get(task.id, 0)
+            latest = self.effective_deadline(task)
+            earliest_finish = now + (depth + 1) * self.task_duration
+            return {
+                'task_id': task.id,
+                'depends_on': sorted(self._blockers.get(task.id, ())),
+                'blocks': sorted(self._dependents.get(task.id, ())),
+                'blocked': task.id in self._blocked,
+                'depth': depth,
+                'earliest_start': (earliest_finish - self.task_duration).isoformat(),
+                'latest_finish': latest.isoformat() if latest else None,
+                'slack_days': (latest - earliest_finish).total_seconds() / 86400 if latest else None,
+            }
+
+
+# Create a singleton instance
+dependency_graph = DependencyGraph()
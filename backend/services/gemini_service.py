@@ -1,11 +1,19 @@
 import os
 from datetime import datetime
 from dotenv import load_dotenv
-import requests
 
 # Load environment variables
 load_dotenv()
 
+GEMINI_API_URL = os.getenv(
+    'GEMINI_API_URL',
+    "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent"
+)
+
+# Upper bound on concurrent Gemini calls made by the async analyzer
+GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', '8'))
+_gemini_semaphore = None
+
 def analyze_task_importance(task):
     """
     Analyze task importance using Gemini API
@@ -38,22 +46,19 @@ def analyze_task_importance(task):
         print(f"Traceback:\n{traceback.format_exc()}")
         return fallback_importance_analysis(task)
 
-def analyze_task_with_rest_api(task, api_key):
-    """Use the REST API to analyze task importance"""
-    try:
-        url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent"
-        headers = {
-            'Content-Type': 'application/json',
-        }
-        
-        # Add API key as query parameter
-        url = f"{url}?key={api_key}"
-        
-        # Create the prompt for task analysis
-        current_date = datetime.utcnow().strftime("%Y-%m-%d")
-        deadline_str = task.deadline.strftime("%Y-%m-%d") if task.deadline else "No deadline"
-        
-        prompt = f"""Analyze this task's importance and respond with ONLY a number (0.0 to 1.0) and a brief explanation, separated by a | character.
+def build_gemini_request(task, api_key):
+    """Build the (url, headers, payload) of a Gemini importance request for a task"""
+    # Add API key as query parameter
+    url = f"{GEMINI_API_URL}?key={api_key}"
+    headers = {
+        'Content-Type': 'application/json',
+    }
+
+    # Create the prompt for task analysis
+    current_date = datetime.utcnow().strftime("%Y-%m-%d")
+    deadline_str = task.deadline.strftime("%Y-%m-%d") if task.deadline else "No deadline"
+
+    prompt = f"""Analyze this task's importance and respond with ONLY a number (0.0 to 1.0) and a brief explanation, separated by a | character.
 
 Task: {task.title}
 Description: {task.description or 'No description'}
@@ -64,71 +69,116 @@ Format: [number]|[explanation]
 Example: 0.8|High priority due to upcoming deadline.
 """
 
-        data = {
-            "contents": [{
-                "parts": [{
-                    "text": prompt
-                }]
-            }],
-            "generationConfig": {
-                "temperature": 0.1,
-                "topK": 1,
-                "topP": 1,
-                "maxOutputTokens": 100,
-            }
+    data = {
+        "contents": [{
+            "parts": [{
+                "text": prompt
+            }]
+        }],
+        "generationConfig": {
+            "temperature": 0.1,
+            "topK": 1,
+            "topP": 1,
+            "maxOutputTokens": 100,
         }
+    }
 
-        print(f"\n📝 Analyzing task: {task.title}")
-        print(f"📝 Description: {task.description or 'No description'}")
-        print(f"📅 Deadline: {deadline_str}")
-        
+    print(f"\n📝 Analyzing task: {task.title}")
+    print(f"📝 Description: {task.description or 'No description'}")
+    print(f"📅 Deadline: {deadline_str}")
+
+    return url, headers, data
+
+def parse_gemini_response(status_code, response_json, response_text=''):
+    """Extract (importance_score, explanation) from a Gemini response, or None if unusable"""
+    if status_code != 200:
+        print(f"❌ Error: API request failed with status code {status_code}")
+        print(f"Response: {response_text}")
+        return None
+
+    try:
+        # Extract the text from the response
+        if 'candidates' in response_json and len(response_json['candidates']) > 0:
+            if 'content' in response_json['candidates'][0]:
+                content = response_json['candidates'][0]['content']
+                if 'parts' in content and len(content['parts']) > 0:
+                    response_text = content['parts'][0]['text'].strip()
+                    
+                    print(f"📝 Raw response: {response_text}")
+                    
+                    if '|' not in response_text:
+                        print("❌ Error: Invalid response format - no delimiter found")
+                        return None
+                        
+                    score_str, explanation = response_text.split('|', 1)
+                    score_str = score_str.strip()
+                    explanation = explanation.strip()
+                    
+                    try:
+                        importance_score = float(score_str)
+                        if not (0 <= importance_score <= 1):
+                            print(f"❌ Error: Score out of range: {importance_score}")
+                            return None
+                        
+                        print(f"\n✅ Analysis complete:")
+                        print(f"Score: {importance_score:.2f}")
+                        print(f"Explanation: {explanation}")
+                        print("=== End Gemini Analysis ===\n")
+                        
+                        return importance_score, explanation
+                    except ValueError:
+                        print(f"❌ Error: Could not convert score to float: {score_str}")
+                        return None
+    except Exception as e:
+        print(f"❌ Error processing Gemini response: {str(e)}")
+    return None
+
+def analyze_task_with_rest_api(task, api_key):
+    """Use the REST API to analyze task importance"""
+    try:
+        import requests  # imported on first Gemini call to keep startup cheap
+
+        url, headers, data = build_gemini_request(task, api_key)
         response = requests.post(url, headers=headers, json=data)
-        if response.status_code == 200:
-            try:
-                response_json = response.json()
-                # Extract the text from the response
-                if 'candidates' in response_json and len(response_json['candidates']) > 0:
-                    if 'content' in response_json['candidates'][0]:
-                        content = response_json['candidates'][0]['content']
-                        if 'parts' in content and len(content['parts']) > 0:
-                            response_text = content['parts'][0]['text'].strip()
-                            
-                            print(f"📝 Raw response: {response_text}")
-                            
-                            if '|' not in response_text:
-                                print("❌ Error: Invalid response format - no delimiter found")
-                                return None
-                                
-                            score_str, explanation = response_text.split('|', 1)
-                            score_str = score_str.strip()
-                            explanation = explanation.strip()
-                            
-                            try:
-                                importance_score = float(score_str)
-                                if not (0 <= importance_score <= 1):
-                                    print(f"❌ Error: Score out of range: {importance_score}")
-                                    return None
-                                
-                                print(f"\n✅ Analysis complete:")
-                                print(f"Score: {importance_score:.2f}")
-                                print(f"Explanation: {explanation}")
-                                print("=== End Gemini Analysis ===\n")
-                                
-                                return importance_score, explanation
-                            except ValueError:
-                                print(f"❌ Error: Could not convert score to float: {score_str}")
-                                return None
-            except Exception as e:
-                print(f"❌ Error processing Gemini response: {str(e)}")
-                return None
-        else:
-            print(f"❌ Error: API request failed with status code {response.status_code}")
-            print(f"Response: {response.text}")
-            return None
+        response_json = response.json() if response.status_code == 200 else None
+        return parse_gemini_response(response.status_code, response_json, response.text)
     except Exception as e:
         print(f"❌ Error calling Gemini REST API: {str(e)}")
         return None
 
+async def analyze_task_importance_async(task, client):
+    """
+    Async variant of analyze_task_importance for the ASGI app.
+    `client` is a shared httpx.AsyncClient; at most GEMINI_MAX_CONCURRENCY
+    requests are in flight at once, the rest wait on the semaphore.
+    """
+    api_key = os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        print("❌ Error: GEMINI_API_KEY not found in environment variables")
+        return fallback_importance_analysis(task)
+
+    try:
+        url, headers, data = build_gemini_request(task, api_key)
+        async with _get_gemini_semaphore():
+            response = await client.post(url, headers=headers, json=data)
+        response_json = response.json() if response.status_code == 200 else None
+        result = parse_gemini_response(response.status_code, response_json, response.text)
+        if result:
+            return result
+    except Exception as e:
+        print(f"❌ Error calling Gemini REST API: {str(e)}")
+
+    print("❌ Gemini API unavailable. Using fallback algorithm.")
+    return fallback_importance_analysis(task)
+
+def _get_gemini_semaphore():
+    global _gemini_semaphore
+    if _gemini_semaphore is None:
+        import asyncio
+
+        _gemini_semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+    return _gemini_semaphore
+
 def fallback_importance_analysis(task):
     """
     Fallback algorithm when Gemini is unavailable
@@ -202,12 +252,14 @@ def analyze_task(task):
     else:
         # This is a dictionary representation of a task
         api_key = os.getenv('GEMINI_API_KEY')
-        url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent"
+        url = GEMINI_API_URL
         
         if not api_key:
             return {"score": 0.5, "explanation": "API key not configured"}
             
         try:
+            import requests
+
             url = f"{url}?key={api_key}"
             headers = {
                 'Content-Type': 'application/json',
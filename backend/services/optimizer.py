@@ -1,147 +1,273 @@
-import numpy as np
 from datetime import datetime
+from services.dependency_graph import dependency_graph
 from services.task_analyzer import analyze_task_importance
 
-def lion_optimization(tasks, num_lions=10, iterations=50):
+# Map numerical priorities to string-based priorities
+PRIORITY_MAPPING = {
+    (0.0, 0.4): 'low',
+    (0.4, 0.7): 'medium',
+    (0.7, 1.0): 'high'
+}
+
+# Optimization strategies accepted by lion_optimization
+OPTIMIZER_MODES = ('lion', 'exact', 'seeded')
+
+# We want roughly 20% high, 40% medium, 40% low priority
+TARGET_DISTRIBUTION = (0.2, 0.4, 0.4)
+
+# Highest priority value inside each band; the fitness rewards the top of a band
+HIGH_PRIORITY, MEDIUM_PRIORITY, LOW_PRIORITY = 1.0, 0.7, 0.4
+
+# Weight multiplier per pending blocker in front of a task, so blockers outrank what they block
+BLOCKED_WEIGHT = 0.8
+
+def priority_label(priority_value):
+    """Translate a numerical priority produced by the optimizer into 'low'/'medium'/'high'"""
+    for (lower, upper), priority_str in PRIORITY_MAPPING.items():
+        if lower <= priority_value <= upper:
+            return priority_str
+    return None
+
+def task_column(tasks, name):
+    """Values of one field for every task; read straight from the columns of a TaskSnapshot"""
+    if hasattr(tasks, 'column'):
+        return tasks.column(name)
+    return [getattr(task, name) for task in tasks]
+
+def task_weights(tasks, now=None):
+    """
+    Weight of every task from deadline proximity, age and analyzed importance,
+    normalized so the largest weight is 1.
+    Deadline proximity is measured on the slack the dependency graph leaves the
+    task, and tasks still waiting on blockers are discounted.
+    """
+    import numpy as np
+
+    now = now or datetime.utcnow()
+
+    def days_from_now(moments, sign):
+        # Plain timedelta arithmetic beats converting datetimes to datetime64 element by element
+        return np.fromiter(
+            (sign * (moment - now).total_seconds() / 86400 if moment is not None else np.nan for moment in moments),
+            dtype=float, count=len(moments)
+        )
+
+    # Slack plus the task's own duration: exactly the days until its deadline for a task
+    # without dependencies, earlier for blockers of urgent tasks. Missing deadlines become NaN
+    task_ids = task_column(tasks, 'id')
+    slack = dependency_graph.slack_days(task_ids, task_column(tasks, 'deadline'), now)
+    duration_days = dependency_graph.task_duration.total_seconds() / 86400
+    days_until_deadline = np.fromiter(
+        (np.nan if days is None else days + duration_days for days in slack),
+        dtype=float, count=len(slack)
+    )
+    deadline_weight = np.select(
+        [
+            np.isnan(days_until_deadline),  # Base weight for tasks without deadline
+            days_until_deadline <= 1,       # Overdue or due within 24 hours
+            days_until_deadline <= 3,       # Due within 3 days
+            days_until_deadline <= 7,       # Due within a week
+            days_until_deadline <= 14,      # Due within 2 weeks
+        ],
+        [0.5, 1.0, 0.9, 0.75, 0.6],
+        default=0.5
+    )
+
+    age_in_days = np.nan_to_num(days_from_now(task_column(tasks, 'created_at'), -1))
+    creation_weight = np.minimum(0.5, age_in_days / 14)  # Max weight after 2 weeks
+
+    # Use the analyzed importance score
+    importance_weight = np.fromiter(
+        (0.5 if score is None else score for score in task_column(tasks, 'importance_score')),
+        dtype=float, count=len(tasks)
+    )
+
+    # Combine all weights with adjusted importance
+    weights = (
+        deadline_weight * 0.5 +      # 50% weight to deadlines (most important)
+        creation_weight * 0.2 +      # 20% weight to task age
+        importance_weight * 0.3      # 30% weight to task importance
+    )
+
+    # Tasks that can't start yet come after the tasks blocking them
+    depths = np.fromiter(dependency_graph.depths(task_ids), dtype=float, count=len(task_ids))
+    weights = weights * BLOCKED_WEIGHT ** depths
+
+    # Normalize weights
+    return weights / np.max(weights) if np.max(weights) > 0 else weights
+
+def calculate_fitness(priorities, weights):
+    """Weighted priority sum minus the deviation from the 20/40/40 high/medium/low split"""
+    import numpy as np
+
+    num_tasks = len(weights)
+    num_high = np.sum(priorities > 0.7)
+    num_medium = np.sum((priorities > 0.4) & (priorities <= 0.7))
+    num_low = np.sum(priorities <= 0.4)
+
+    target_high, target_medium, target_low = (share * num_tasks for share in TARGET_DISTRIBUTION)
+
+    distribution_penalty = (
+        abs(num_high - target_high) +
+        abs(num_medium - target_medium) +
+        abs(num_low - target_low)
+    ) / num_tasks
+
+    # Calculate weighted priority fitness
+    priority_fitness = np.sum(priorities * weights)
+
+    return priority_fitness - distribution_penalty
+
+def exact_priorities(weights):
+    """
+    Priorities that maximize calculate_fitness exactly, in O(n log n).
+
+    Within a band the fitness only grows with the priority value, so every task
+    sits at the top of its band (1.0 / 0.7 / 0.4), and by the rearrangement
+    inequality the heaviest tasks take the highest band. What remains is picking
+    the two cut points in the weight ranking: `a` tasks high, `b - a` medium,
+    `n - b` low.
+
+    For a fixed `a` the fitness is concave in `b` (a concave prefix sum minus
+    convex absolute values), so its maximum lies where the marginal gain
+    0.3 * w[b] - (penalty change) / n stops being positive. The penalty change
+    only moves at the targets a + 0.4n and 0.6n, so the optimal `b` is one of a
+    handful of candidates; all (a, candidate) pairs are scored at once with
+    prefix sums.
+    """
+    import numpy as np
+
+    num_tasks = len(weights)
+    if num_tasks == 0:
+        return np.array([])
+
+    order = np.argsort(-weights, kind='stable')
+    sorted_weights = weights[order]
+    prefix = np.concatenate(([0.0], np.cumsum(sorted_weights)))
+    total = prefix[-1]
+
+    target_high, target_medium, target_low = (share * num_tasks for share in TARGET_DISTRIBUTION)
+    band_gap = HIGH_PRIORITY - MEDIUM_PRIORITY  # == MEDIUM_PRIORITY - LOW_PRIORITY
+
+    a = np.arange(num_tasks + 1)
+    medium_end = a + target_medium       # b at which the medium count hits its target
+    low_start = num_tasks - target_low   # b at which the low count hits its target
+    # Past both targets each extra medium costs 2/n; it only pays for weights above that
+    worth_promoting = int(np.sum(band_gap * sorted_weights > 2.0 / num_tasks))
+
+    candidates = [
+        a,
+        np.full_like(a, num_tasks),
+        np.floor(medium_end), np.ceil(medium_end),
+        np.full_like(a, int(np.floor(low_start))), np.full_like(a, int(np.ceil(low_start))),
+        np.full_like(a, worth_promoting),
+        np.maximum(np.maximum(np.ceil(medium_end), np.ceil(low_start)), worth_promoting),
+    ]
+
+    best_fitness, best_a, best_b = float('-inf'), 0, 0
+    for b in candidates:
+        b = np.clip(b, a, num_tasks).astype(int)
+        fitness = (
+            HIGH_PRIORITY * prefix[a] +
+            MEDIUM_PRIORITY * (prefix[b] - prefix[a]) +
+            LOW_PRIORITY * (total - prefix[b]) -
+            (np.abs(a - target_high) + np.abs(b - a - target_medium) + np.abs(num_tasks - b - target_low)) / num_tasks
+        )
+        i = int(np.argmax(fitness))
+        if fitness[i] > best_fitness:
+            best_fitness, best_a, best_b = fitness[i], int(a[i]), int(b[i])
+
+    ranked = np.full(num_tasks, LOW_PRIORITY)
+    ranked[:best_a] = HIGH_PRIORITY
+    ranked[best_a:best_b] = MEDIUM_PRIORITY
+
+    priorities = np.empty(num_tasks)
+    priorities[order] = ranked
+    return priorities
+
+def lion_optimization(tasks, num_lions=10, iterations=50, mode='lion'):
+    """
+    Assign a numerical priority (0..1) to every task.
+    `tasks` is a list of Task objects or a TaskSnapshot.
+
+    mode='lion'   - stochastic Lion Optimization random walk
+    mode='exact'  - deterministic optimum of the same fitness (see exact_priorities)
+    mode='seeded' - lion search starting from the exact solution
+    """
     if not tasks:
         return []
-    
-    print(f"\nStarting optimization with {len(tasks)} tasks")
-    
+    if mode not in OPTIMIZER_MODES:
+        raise ValueError(f"Unknown optimizer mode '{mode}', expected one of: {', '.join(OPTIMIZER_MODES)}")
+
+    # NumPy is only needed once an optimization actually runs; keep it out of app startup
+    import numpy as np
+
+    print(f"\nStarting {mode} optimization with {len(tasks)} tasks")
+
     # First, get task analysis for each task using our built-in analyzer
-    for task in tasks:
+    for index, score in enumerate(task_column(tasks, 'importance_score')):
+        # Only analyze if we haven't already
+        if score is not None:
+            continue
+        task = tasks[index]
         try:
-            # Only analyze if we haven't already
-            if task.importance_score is None:
-                importance_score, explanation = analyze_task_importance(task)
-                task.importance_score = importance_score
-                task.importance_explanation = explanation
-                print(f"\nTask: {task.title}")
-                print(f"Importance Score: {importance_score:.2f}")
-                print(f"Explanation: {explanation}")
+            importance_score, explanation = analyze_task_importance(task)
+            task.importance_score = importance_score
+            task.importance_explanation = explanation
+            task.analyzed_at = datetime.utcnow()
+            print(f"\nTask: {task.title}")
+            print(f"Importance Score: {importance_score:.2f}")
+            print(f"Explanation: {explanation}")
         except Exception as e:
             print(f"Error analyzing task '{task.title}': {str(e)}")
             # Use default values if analysis fails
             task.importance_score = 0.5
             task.importance_explanation = "Could not analyze importance"
-    
+
     # Parameters for the algorithm
     num_tasks = len(tasks)
-    
-    # Initialize lion positions (task priorities)
-    lions = np.random.rand(num_lions, num_tasks) * 0.5 + 0.25  # Initialize in middle range
-    best_lion = None
-    best_fitness = float('-inf')
-    
-    # Fitness function considering deadline, creation time, and task importance
-    def calculate_fitness(priorities):
-        fitness = 0
-        
-        # Calculate weights for each task
-        weights = []
-        for i, task in enumerate(tasks):
-            deadline_weight = 0.5  # Base weight for tasks without deadline
-            if task.deadline:
-                time_until_deadline = (task.deadline - datetime.utcnow()).total_seconds()
-                days_until_deadline = time_until_deadline / 86400  # Convert to days
-                
-                # Handle overdue tasks
-                if days_until_deadline < 0:
-                    deadline_weight = 1.0  # Highest priority for overdue tasks
-                    print(f"Task '{task.title}' is overdue by {abs(days_until_deadline):.1f} days")
-                # Handle upcoming deadlines
-                else:
-                    if days_until_deadline <= 1:  # Due within 24 hours
-                        deadline_weight = 1.0
-                        print(f"Task '{task.title}' is due within 24 hours")
-                    elif days_until_deadline <= 3:  # Due within 3 days
-                        deadline_weight = 0.9
-                        print(f"Task '{task.title}' is due within 3 days")
-                    elif days_until_deadline <= 7:  # Due within a week
-                        deadline_weight = 0.75
-                        print(f"Task '{task.title}' is due within a week")
-                    elif days_until_deadline <= 14:  # Due within 2 weeks
-                        deadline_weight = 0.6
-                        print(f"Task '{task.title}' is due within 2 weeks")
-                    else:
-                        deadline_weight = 0.5
-                        print(f"Task '{task.title}' is due in {days_until_deadline:.1f} days")
-            
-            age_in_days = (datetime.utcnow() - task.created_at).total_seconds() / 86400
-            creation_weight = min(0.5, age_in_days / 14)  # Max weight after 2 weeks
-            
-            # Use the analyzed importance score
-            importance_weight = task.importance_score if task.importance_score is not None else 0.5
-            
-            # Combine all weights with adjusted importance
-            total_weight = (
-                deadline_weight * 0.5 +      # 50% weight to deadlines (most important)
-                creation_weight * 0.2 +      # 20% weight to task age
-                importance_weight * 0.3      # 30% weight to task importance
-            )
-            
-            weights.append(total_weight)
-            print(f"\nTask '{task.title}' weights:")
-            print(f"- Deadline weight: {deadline_weight:.2f}")
-            print(f"- Creation weight: {creation_weight:.2f}")
-            print(f"- Importance weight: {importance_weight:.2f}")
-            print(f"= Total weight: {total_weight:.2f}")
-            
-        # Normalize weights
-        weights = np.array(weights)
-        weights = weights / np.max(weights) if np.max(weights) > 0 else weights
-        
-        # Calculate priority distribution penalty
-        # We want roughly 20% high, 40% medium, 40% low priority
-        num_high = np.sum(priorities > 0.7)
-        num_medium = np.sum((priorities > 0.4) & (priorities <= 0.7))
-        num_low = np.sum(priorities <= 0.4)
-        
-        target_high = 0.2 * num_tasks
-        target_medium = 0.4 * num_tasks
-        target_low = 0.4 * num_tasks
-        
-        distribution_penalty = (
-            abs(num_high - target_high) +
-            abs(num_medium - target_medium) +
-            abs(num_low - target_low)
-        ) / num_tasks
-        
-        # Calculate weighted priority fitness
-        priority_fitness = np.sum(priorities * weights)
-        
-        # Combine fitness components
-        fitness = priority_fitness - distribution_penalty
-        
-        print(f"\nFitness calculation:")
-        print(f"Priority fitness: {priority_fitness:.2f}")
-        print(f"Distribution penalty: {distribution_penalty:.2f}")
-        print(f"Final fitness: {fitness:.2f}")
-        return fitness
-    
+
+    # Weights don't change between fitness evaluations; compute them once
+    weights = task_weights(tasks)
+
+    if mode == 'exact':
+        best_lion = exact_priorities(weights)
+        print(f"\nExact fitness: {calculate_fitness(best_lion, weights):.2f}")
+        return best_lion
+
+    if mode == 'seeded':
+        # Start every lion at the exact solution and let the walk explore around it
+        best_lion = exact_priorities(weights)
+        best_fitness = calculate_fitness(best_lion, weights)
+        lions = np.tile(best_lion, (num_lions, 1))
+    else:
+        # Initialize lion positions (task priorities)
+        lions = np.random.rand(num_lions, num_tasks) * 0.5 + 0.25  # Initialize in middle range
+        best_lion = None
+        best_fitness = float('-inf')
+
     # Main optimization loop
     for iteration in range(iterations):
-        print(f"\nIteration {iteration + 1}/{iterations}")
         # Update each lion's position
         for i in range(num_lions):
             # Random walk with smaller step size
             lions[i] += np.random.normal(0, 0.05, num_tasks)
             lions[i] = np.clip(lions[i], 0, 1)
-            
+
             # Calculate fitness
-            current_fitness = calculate_fitness(lions[i])
-            
+            current_fitness = calculate_fitness(lions[i], weights)
+
             if current_fitness > best_fitness:
                 best_fitness = current_fitness
                 best_lion = lions[i].copy()
-                print(f"New best fitness: {best_fitness:.2f}")
-    
+                print(f"Iteration {iteration + 1}/{iterations}: new best fitness {best_fitness:.2f}")
+
     if best_lion is None:
         print("\nWarning: No best lion found, returning balanced priorities")
         # Return a balanced distribution instead of all ones
         return np.array([0.3 if i < num_tasks * 0.4 else
                         0.6 if i < num_tasks * 0.8 else
                         0.9 for i in range(num_tasks)])
-        
+
     print(f"\nFinal best fitness: {best_fitness:.2f}")
-    return best_lion
\ No newline at end of file
+    return best_lion
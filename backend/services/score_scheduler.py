@@ -0,0 +1,150 @@
+"""
+Keeps stored importance scores fresh as time passes.
+
+The built-in analyzer buckets tasks by deadline proximity and age, so a stored
+importance_score only goes stale when one of those buckets changes. Instead of
+re-analyzing the whole table periodically, the scheduler keeps a min-heap of the
+next bucket transition for every pending task and re-scores only the tasks whose
+transition time has passed.
+
+The heap lives in memory and worker processes come and go, so every score is
+stored with the time it was computed (analyzed_at). On first load each pending
+task is scheduled at its first transition after that time: tasks that crossed
+a boundary while nothing was watching are due at once, the rest wait. Tasks
+never scored (or scored before analyzed_at existed) are due at once too. The
+catch-up is spread over requests in batches of REFRESH_BATCH_SIZE.
+"""
+
+import heapq
+import threading
+from datetime import datetime
+
+from models.task import Task
+from services.task_analyzer import task_analyzer, analyze_task_importance
+
+# Most tasks re-scored by one refresh, so the first-load catch-up doesn't stall a request
+REFRESH_BATCH_SIZE = 1000
+
+
+class ScoreScheduler:
+    """Min-heap of upcoming score bucket transitions, keyed by task id"""
+
+    def __init__(self):
+        self._heap = []  # (transition_time, task_id)
+        self._scheduled = {}  # task_id -> transition_time of its live heap entry
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def schedule(self, task, now=None):
+        """(Re)schedule a task after it was created, updated or re-scored"""
+        if task.completed:
+            self.unschedule(task.id)
+            return
+
+        transition = task_analyzer.next_transition(task, now)
+        with self._lock:
+            if transition is None:
+                self._scheduled.pop(task.id, None)
+                return
+            self._scheduled[task.id] = transition
+            heapq.heappush(self._heap, (transition, task.id))
+
+    def unschedule(self, task_id):
+        """Forget a task; its stale heap entries are skipped lazily when popped"""
+        with self._lock:
+            self._scheduled.pop(task_id, None)
+
+    def requeue(self, task_ids, when):
+        """Put tasks back on the heap so they become due again after `when`"""
+        with self._lock:
+            for task_id in task_ids:
+                self._scheduled[task_id] = when
+                heapq.heappush(self._heap, (when, task_id))
+
+    def ensure_loaded(self, session):
+        """
+        Build the heap from the pending tasks on first use, scheduling each task at
+        the first transition after its score was computed. Tasks without analyzed_at
+        are due at once.
+        """
+        if self._loaded:
+            return
+
+        scheduled = {}
+        tasks = session.query(
+            Task.id, Task.deadline, Task.created_at, Task.analyzed_at
+        ).filter_by(completed=False)
+        for task in tasks:
+            if task.analyzed_at is None:
+                scheduled[task.id] = datetime.min
+                continue
+            transition = task_analyzer.next_transition(task, task.analyzed_at)
+            if transition is not None:
+                scheduled[task.id] = transition
+
+        with self._lock:
+            if self._loaded:
+                return
+            self._scheduled = scheduled
+            self._heap = [(transition, task_id) for task_id, transition in scheduled.items()]
+            heapq.heapify(self._heap)
+            self._loaded = True
+
+    def pop_due(self, now=None, limit=None):
+        """Remove and return the ids of (at most `limit`) tasks whose transition is before `now`"""
+        now = now or datetime.utcnow()
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] < now and (limit is None or len(due) < limit):
+                transition, task_id = heapq.heappop(self._heap)
+                # Skip entries superseded by a later schedule() or unschedule()
+                if self._scheduled.get(task_id) != transition:
+                    continue
+                del self._scheduled[task_id]
+                due.append(task_id)
+        return due
+
+    def reset(self):
+        """Drop all state; the heap is rebuilt from the database on next use"""
+        with self._lock:
+            self._heap = []
+            self._scheduled = {}
+            self._loaded = False
+
+
+# Create a singleton instance
+score_scheduler = ScoreScheduler()
+
+
+def refresh_stale_scores(session, now=None):
+    """
+    Re-score the tasks whose deadline/age bucket changed since they were last analyzed.
+    Returns the number of tasks that were re-analyzed.
+    """
+    score_scheduler.ensure_loaded(session)
+    now = now or datetime.utcnow()
+
+    due_ids = score_scheduler.pop_due(now, limit=REFRESH_BATCH_SIZE)
+    if not due_ids:
+        return 0
+
+    tasks = session.query(Task).filter(Task.id.in_(due_ids), Task.completed.is_(False)).all()
+    for task in tasks:
+        importance_score, explanation = analyze_task_importance(task)
+        task.importance_score = importance_score
+        task.importance_explanation = explanation
+        task.analyzed_at = now
+
+    try:
+        session.commit()
+    except Exception:
+        session.rollback()
+        # Put the tasks back so the next request retries them
+        score_scheduler.requeue(due_ids, now)
+        raise
+
+    for task in tasks:
+        score_scheduler.schedule(task, now)
+
+    print(f"Refreshed importance scores for {len(tasks)} task(s)")
+    return len(tasks)
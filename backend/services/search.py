@@ -0,0 +1,148 @@
+"""
+Full-text search over task titles and descriptions.
+
+On SQLite the search is served by an FTS5 virtual table (task_fts) that mirrors
+the task table through triggers, so every insert/update/delete - ORM or not -
+keeps the index in sync. Other engines, or SQLite builds without FTS5, fall back
+to a LIKE scan.
+"""
+
+import threading
+
+from sqlalchemy import or_, text
+
+from models.task import Task
+
+FTS_SETUP_STATEMENTS = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5(
+        title, description, content='task', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_fts_ai AFTER INSERT ON task BEGIN
+        INSERT INTO task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_fts_ad AFTER DELETE ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_fts_au AFTER UPDATE OF title, description ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+)
+
+_fts_ready = {}  # engine url -> whether FTS5 is available
+_fts_lock = threading.Lock()
+
+
+def fts_available(session):
+    """Create the FTS5 table and triggers on first use; False when FTS5 can't be used"""
+    engine = session.get_bind()
+    key = str(engine.url)
+    if key in _fts_ready:
+        return _fts_ready[key]
+
+    with _fts_lock:
+        if key in _fts_ready:
+            return _fts_ready[key]
+
+        if engine.dialect.name != 'sqlite':
+            _fts_ready[key] = False
+            return False
+
+        try:
+            with engine.begin() as connection:
+                exists = connection.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_fts'")
+                ).first()
+                for statement in FTS_SETUP_STATEMENTS:
+                    connection.execute(text(statement))
+                if not exists:
+                    # Index the rows that were written before the triggers existed
+                    connection.execute(text("INSERT INTO task_fts(task_fts) VALUES ('rebuild')"))
+            _fts_ready[key] = True
+        except Exception as e:
+            print(f"FTS5 unavailable, falling back to LIKE search: {str(e)}")
+            _fts_ready[key] = False
+
+    return _fts_ready[key]
+
+
+def _fts_query(terms):
+    """
+    Quote every term so user input can't inject FTS5 query syntax; terms are ANDed.
+    Each term is a prefix query so that partial words match like they do on the LIKE fallback.
+    """
+    return ' '.join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+
+def search_tasks(session, query, completed=None, priority=None, limit=20, offset=0):
+    """
+    Search tasks by title and description.
+    Returns (results, total) where results is a list of (task, rank, snippet)
+    ordered best match first. rank and snippet are None on the LIKE fallback.
+    """
+    terms = query.split()
+    if not terms:
+        return [], 0
+
+    if fts_available(session):
+        return _search_fts(session, terms, completed, priority, limit, offset)
+    return _search_like(session, terms, completed, priority, limit, offset)
+
+
+def _search_fts(session, terms, completed, priority, limit, offset):
+    filters = ''
+    params = {'match': _fts_query(terms), 'limit': limit, 'offset': offset}
+    if completed is not None:
+        filters += ' AND task.completed = :completed'
+        params['completed'] = completed
+    if priority is not None:
+        filters += ' AND task.priority = :priority'
+        params['priority'] = priority
+
+    base = f"""
+        FROM task_fts JOIN task ON task.id = task_fts.rowid
+        WHERE task_fts MATCH :match{filters}
+    """
+    total = session.execute(text(f"SELECT COUNT(*) {base}"), params).scalar()
+    rows = session.execute(
+        text(f"""
+            SELECT task.id AS id,
+                   bm25(task_fts) AS rank,
+                   snippet(task_fts, -1, '<mark>', '</mark>', '...', 12) AS snippet
+            {base}
+            ORDER BY rank
+            LIMIT :limit OFFSET :offset
+        """),
+        params
+    ).all()
+
+    tasks = {task.id: task for task in session.query(Task).filter(Task.id.in_([row.id for row in rows])).all()}
+    results = [(tasks[row.id], row.rank, row.snippet) for row in rows if row.id in tasks]
+    return results, total
+
+
+def _search_like(session, terms, completed, priority, limit, offset):
+    query = session.query(Task)
+    for term in terms:
+        pattern = f"%{term}%"
+        query = query.filter(or_(Task.title.ilike(pattern), Task.description.ilike(pattern)))
+    if completed is not None:
+        query = query.filter_by(completed=completed)
+    if priority is not None:
+        query = query.filter_by(priority=priority)
+
+    total = query.count()
+    tasks = query.order_by(Task.id.desc()).limit(limit).offset(offset).all()
+    return [(task, None, None) for task in tasks], total
@@ -0,0 +1,119 @@
+"""
+Read-only columnar snapshot of tasks for the analyzer and optimizer.
+
+Loading a large board as SQLAlchemy Task instances pays for the identity map,
+attribute instrumentation and per-object state even though the optimizer only
+reads a handful of fields. TaskSnapshot loads those fields with a Core select
+straight into one list per column; TaskRecord is a light __slots__ view over a
+row that the analyzer, optimizer and schemas can read like a Task.
+"""
+
+from sqlalchemy import select
+
+from models.task import Task, compute_rank
+
+SNAPSHOT_FIELDS = (
+    'id', 'title', 'description', 'deadline', 'priority', 'completed',
+    'created_at', 'completed_at', 'importance_score', 'importance_explanation', 'analyzed_at',
+)
+
+# Fields the analyzer/optimizer may fill in; everything else is read-only
+WRITABLE_FIELDS = ('priority', 'importance_score', 'importance_explanation', 'analyzed_at')
+
+
+class TaskRecord:
+    """Attribute view of one snapshot row; assignments to writable fields go to the snapshot"""
+
+    __slots__ = ('_snapshot', '_index')
+
+    def __init__(self, snapshot, index):
+        self._snapshot = snapshot
+        self._index = index
+
+
+def _field_property(name):
+    def getter(record):
+        return record._snapshot.columns[name][record._index]
+
+    def setter(record, value):
+        record._snapshot.set(record._index, name, value)
+
+    return property(getter, setter if name in WRITABLE_FIELDS else None)
+
+
+for _name in SNAPSHOT_FIELDS:
+    setattr(TaskRecord, _name, _field_property(_name))
+
+
+class TaskSnapshot:
+    """Tasks stored column-wise; len() and iteration behave like a list of tasks"""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.changed = set()  # row indexes whose writable fields were modified
+        self.original = {}  # (index, field) -> value as loaded, for modified fields
+
+    @staticmethod
+    def select_statement(completed=None):
+        """Core select of the snapshot columns, optionally filtered on completion"""
+        table = Task.__table__
+        statement = select(*(table.c[name] for name in SNAPSHOT_FIELDS))
+        if completed is not None:
+            statement = statement.where(table.c.completed == completed)
+        return statement
+
+    @classmethod
+    def from_rows(cls, rows):
+        rows = list(rows)
+        if rows:
+            columns = {name: list(values) for name, values in zip(SNAPSHOT_FIELDS, zip(*rows))}
+        else:
+            columns = {name: [] for name in SNAPSHOT_FIELDS}
+        return cls(columns)
+
+    @classmethod
+    def load(cls, session, completed=None):
+        """Load a snapshot through a (sync) session without creating ORM objects"""
+        return cls.from_rows(session.execute(cls.select_statement(completed)))
+
+    def __len__(self):
+        return len(self.columns['id'])
+
+    def __iter__(self):
+        return (TaskRecord(self, index) for index in range(len(self)))
+
+    def __getitem__(self, index):
+        return TaskRecord(self, index)
+
+    def column(self, name):
+        return self.columns[name]
+
+    def set(self, index, name, value):
+        if name not in WRITABLE_FIELDS:
+            raise AttributeError(f"Snapshot field '{name}' is read-only")
+        column = self.columns[name]
+        if column[index] != value:
+            self.original.setdefault((index, name), column[index])
+            column[index] = value
+            self.changed.add(index)
+
+    def original_value(self, index, name):
+        """Value of a field as loaded from the database, before any set()"""
+        return self.original.get((index, name), self.columns[name][index])
+
+    def changed_rows(self):
+        """Parameters for a bulk UPDATE by primary key of every modified row"""
+        rows = []
+        for index in sorted(self.changed):
+            priority = self.columns['priority'][index]
+            importance_score = self.columns['importance_score'][index]
+            rows.append({
+                'id': self.columns['id'][index],
+                'priority': priority,
+                'importance_score': importance_score,
+                'importance_explanation': self.columns['importance_explanation'][index],
+                'analyzed_at': self.columns['analyzed_at'][index],
+                # Bulk updates skip mapper events, so keep rank_score in sync here
+                'rank_score': compute_rank(priority, importance_score),
+            })
+        return rows
@@ -6,10 +6,19 @@ Analyzes task importance based on multiple factors without external API dependen
 from datetime import datetime, timedelta
 import re
 
+from services.dependency_graph import dependency_graph
+
 
 class TaskAnalyzer:
     """Task analysis system that evaluates task importance based on multiple factors"""
 
+    # Day offsets (relative to the deadline) at which _analyze_deadline changes score.
+    # Negative values are "days before the deadline", positive "days overdue".
+    DEADLINE_BOUNDARY_DAYS = (-30, -14, -7, -3, -2, -1, 0, 3, 7, 14, 30)
+
+    # Task ages (in days) at which _analyze_task_age changes score
+    AGE_BOUNDARY_DAYS = (3, 7, 14, 30)
+
     def __init__(self):
         # Keywords that indicate high importance when found in title or description
         self.high_priority_keywords = [
@@ -29,7 +38,9 @@ class TaskAnalyzer:
     def analyze_task(self, task):
         """
         Analyze task importance and return a score between 0.0 and 1.0
-        along with an explanation
+        along with an explanation.
+        `task` is a Task or anything with the same fields, such as a TaskRecord
+        from a TaskSnapshot.
         """
         factors = []
         explanations = []
@@ -40,6 +51,8 @@ class TaskAnalyzer:
         
         # === FACTOR 1: DEADLINE PROXIMITY ===
         deadline_score, deadline_reason = self._analyze_deadline(task)
+        if deadline_reason and dependency_graph.effective_deadline(task) != task.deadline:
+            deadline_reason += " Tasks that depend on it set this deadline."
         if deadline_reason:
             factors.append(("Deadline", deadline_score))
             explanations.append(deadline_reason)
@@ -95,12 +108,32 @@ class TaskAnalyzer:
         
         return final_score, explanation
 
+    def next_transition(self, task, now=None):
+        """
+        Return the first moment after `now` at which the deadline or age factor
+        of this task moves to a different score bucket, or None if it never will.
+        """
+        now = now or datetime.utcnow()
+        candidates = []
+
+        deadline = dependency_graph.effective_deadline(task)
+        if deadline:
+            candidates.extend(deadline + timedelta(days=days) for days in self.DEADLINE_BOUNDARY_DAYS)
+
+        if task.created_at:
+            candidates.extend(task.created_at + timedelta(days=days) for days in self.AGE_BOUNDARY_DAYS)
+
+        upcoming = [moment for moment in candidates if moment >= now]
+        return min(upcoming) if upcoming else None
+
     def _analyze_deadline(self, task):
         """Analyze deadline proximity and return a score adjustment and reason"""
-        if not task.deadline:
+        # A task that blocks others must finish before their deadlines allow
+        deadline = dependency_graph.effective_deadline(task)
+        if not deadline:
             return 0, "No deadline specified."
         
-        time_until_deadline = (task.deadline - datetime.utcnow()).total_seconds()
+        time_until_deadline = (deadline - datetime.utcnow()).total_seconds()
         days_until_deadline = time_until_deadline / 86400  # Convert to days
         
         # Overdue tasks
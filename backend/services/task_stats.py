@@ -0,0 +1,216 @@
+"""
+Incrementally maintained task summary statistics for the dashboard.
+
+Session events collect the before/after state of every Task touched by a
+flush and apply the difference to an in-memory aggregate once the transaction
+commits, so serving GET /tasks/stats never reads the task table. Deadlines of
+pending tasks are kept sorted, which answers "overdue" and "due this week"
+with two binary searches. Archived tasks are counted separately and included
+in the completed total. The aggregate is rebuilt from the database on first
+use, after bulk writes that didn't report their changes, and periodically to
+correct any drift.
+"""
+
+import bisect
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from models.task import Task, ArchivedTask
+
+STAT_FIELDS = ('completed', 'priority', 'deadline')
+
+
+class TaskStats:
+    """Counts by completion and priority plus the sorted deadlines of pending tasks"""
+
+    def __init__(self):
+        self._completed = 0
+        self._archived = 0  # completed tasks moved to the archive
+        self._pending = Counter()  # priority -> number of pending tasks
+        self._deadlines = []  # sorted deadlines of pending tasks
+        self._loaded = False
+        self._stale = False
+        self._reconciled_at = 0.0
+        self._lock = threading.Lock()
+
+    def apply(self, changes, archived=0):
+        """
+        Apply (before, after) state pairs; None means the task didn't / no longer exists.
+        `archived` is the change in the number of archived tasks.
+        """
+        with self._lock:
+            if not self._loaded:
+                return
+            self._archived += archived
+            for before, after in changes:
+                if before is not None:
+                    self._remove(before)
+                if after is not None:
+                    self._add(after)
+
+    def _add(self, state):
+        completed, priority, deadline = state
+        if completed:
+            self._completed += 1
+            return
+        self._pending[priority] += 1
+        if deadline is not None:
+            bisect.insort(self._deadlines, deadline)
+
+    def _remove(self, state):
+        completed, priority, deadline = state
+        if completed:
+            self._completed -= 1
+            return
+        self._pending[priority] -= 1
+        if deadline is not None:
+            index = bisect.bisect_left(self._deadlines, deadline)
+            if index < len(self._deadlines) and self._deadlines[index] == deadline:
+                del self._deadlines[index]
+            else:
+                # The aggregate drifted from the database; rebuild it on next read
+                self._stale = True
+
+    def invalidate(self):
+        """Force a rebuild from the database on next read"""
+        with self._lock:
+            self._stale = True
+
+    def needs_reconcile(self, max_age):
+        return not self._loaded or self._stale or time.monotonic() - self._reconciled_at > max_age
+
+    def reconcile(self, session):
+        """Rebuild the aggregate from the task table"""
+        counts = session.execute(
+            select(Task.completed, Task.priority, func.count()).group_by(Task.completed, Task.priority)
+        ).all()
+        archived = session.execute(select(func.count()).select_from(ArchivedTask)).scalar()
+        deadlines = session.scalars(
+            select(Task.deadline)
+            .where(Task.completed == False, Task.deadline.is_not(None))  # noqa: E712
+            .order_by(Task.deadline)
+        ).all()
+
+        with self._lock:
+            self._completed = sum(count for completed, _, count in counts if completed)
+            self._archived = archived
+            self._pending = Counter({priority: count for completed, priority, count in counts if not completed})
+            self._deadlines = list(deadlines)
+            self._loaded = True
+            self._stale = False
+            self._reconciled_at = time.monotonic()
+
+    def summary(self, now=None):
+        now = now or datetime.utcnow()
+        with self._lock:
+            pending = sum(self._pending.values())
+            overdue = bisect.bisect_left(self._deadlines, now)
+            due_this_week = bisect.bisect_right(self._deadlines, now + timedelta(days=7)) - overdue
+            completed = self._completed + self._archived
+            return {
+                'total': pending + completed,
+                'completed': completed,
+                'archived': self._archived,
+                'pending': pending,
+                'pending_by_priority': {
+                    priority: self._pending.get(priority, 0) for priority in ('high', 'medium', 'low')
+                },
+                'overdue': overdue,
+                'due_this_week': due_this_week,
+                'generated_at': now.isoformat(),
+            }
+
+
+# Create a singleton instance
+task_stats = TaskStats()
+
+
+def task_state(task, committed=False):
+    """(completed, priority, deadline) of a Task, as last loaded from the database if `committed`"""
+    state = inspect(task)
+    values = []
+    for name in STAT_FIELDS:
+        value = state.dict.get(name)
+        if committed and name in state.committed_state:
+            value = state.committed_state[name]
+        values.append(value)
+    completed, priority, deadline = values
+    return bool(completed), priority or 'medium', deadline
+
+
+def record_task_changes(session, changes):
+    """Queue (before, after) state pairs to apply when the session commits"""
+    session.info.setdefault('task_stats_changes', []).extend(changes)
+
+
+def record_archived_changes(session, count):
+    """Queue a change in the number of archived tasks to apply when the session commits"""
+    session.info['task_stats_archived'] = session.info.get('task_stats_archived', 0) + count
+
+
+def record_snapshot_changes(session, snapshot):
+    """Queue the priority changes a TaskSnapshot is about to write with a bulk UPDATE"""
+    changes = []
+    for index in snapshot.changed:
+        completed = bool(snapshot.columns['completed'][index])
+        deadline = snapshot.columns['deadline'][index]
+        before = (completed, snapshot.original_value(index, 'priority') or 'medium', deadline)
+        after = (completed, snapshot.columns['priority'][index] or 'medium', deadline)
+        if before != after:
+            changes.append((before, after))
+    record_task_changes(session, changes)
+
+
+@event.listens_for(Session, 'after_flush')
+def collect_task_changes(session, flush_context):
+    changes = []
+    for obj in session.new:
+        if isinstance(obj, Task):
+            changes.append((None, task_state(obj)))
+    for obj in session.dirty:
+        if isinstance(obj, Task) and session.is_modified(obj):
+            changes.append((task_state(obj, committed=True), task_state(obj)))
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            changes.append((task_state(obj, committed=True), None))
+    if changes:
+        record_task_changes(session, changes)
+    # Restoring deletes the ArchivedTask through the session; archiving reports its bulk insert
+    archived = sum(isinstance(obj, ArchivedTask) for obj in session.new) - sum(
+        isinstance(obj, ArchivedTask) for obj in session.deleted
+    )
+    if archived:
+        record_archived_changes(session, archived)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def invalidate_on_unreported_bulk_write(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if orm_execute_state.bind_mapper is None or orm_execute_state.bind_mapper.class_ is not Task:
+        return
+    # Bulk writes bypass the flush; callers that don't report their changes force a rebuild
+    if not orm_execute_state.execution_options.get('task_stats_recorded'):
+        orm_execute_state.session.info['task_stats_stale'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def apply_task_changes(session):
+    changes = session.info.pop('task_stats_changes', None)
+    archived = session.info.pop('task_stats_archived', 0)
+    if session.info.pop('task_stats_stale', False):
+        task_stats.invalidate()
+    elif changes or archived:
+        task_stats.apply(changes or [], archived)
+
+
+@event.listens_for(Session, 'after_rollback')
+def discard_task_changes(session):
+    session.info.pop('task_stats_changes', None)
+    session.info.pop('task_stats_archived', None)
+    session.info.pop('task_stats_stale', None)
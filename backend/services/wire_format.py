@@ -0,0 +1,169 @@
+"""
+Compact wire formats and response compression for task payloads.
+
+Task lists are normally sent as a JSON array of task objects, repeating every
+key for every task and spelling datetimes out as ISO strings. Clients can ask
+for a columnar document instead - field names once, then one array per task,
+datetimes as epoch milliseconds - either as JSON or as MessagePack, with the
+Accept header or ?format=columnar|msgpack.
+
+Independently of the format, responses larger than COMPRESS_MIN_BYTES are
+compressed with brotli or gzip when the client accepts it.
+
+task_list_response and compress_response take the app, request and response
+objects as arguments, so the Flask and Quart blueprints share them and only
+keep their framework glue.
+"""
+
+import gzip
+import json
+from datetime import datetime, timedelta
+
+from schemas.task import tasks_schema
+
+COLUMNAR_JSON_MIMETYPE = 'application/vnd.tasklion.columnar+json'
+MSGPACK_MIMETYPE = 'application/x-msgpack'
+
+# ?format= value -> mimetype
+WIRE_FORMATS = {
+    'json': 'application/json',
+    'columnar': COLUMNAR_JSON_MIMETYPE,
+    'msgpack': MSGPACK_MIMETYPE,
+}
+
+TASK_FIELDS = (
+    'id', 'title', 'description', 'deadline', 'priority', 'completed',
+    'created_at', 'completed_at', 'importance_score', 'importance_explanation',
+)
+
+# Sent as epoch milliseconds (UTC) in the columnar formats
+DATETIME_FIELDS = ('deadline', 'created_at', 'completed_at')
+
+_EPOCH = datetime(1970, 1, 1)
+_MILLISECOND = timedelta(milliseconds=1)
+
+
+class UnsupportedFormat(ValueError):
+    """The requested wire format is unknown or its encoder isn't installed"""
+
+
+def msgpack_available():
+    try:
+        import msgpack  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def brotli_available():
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def negotiate_format(args, accept_mimetypes):
+    """
+    Pick the wire format for a task list from ?format= or else the Accept header.
+    Raises UnsupportedFormat for an explicit ?format= that can't be served.
+    """
+    requested = args.get('format')
+    if requested:
+        if requested not in WIRE_FORMATS:
+            raise UnsupportedFormat(f"Format must be one of: {', '.join(WIRE_FORMATS)}")
+        if requested == 'msgpack' and not msgpack_available():
+            raise UnsupportedFormat("MessagePack support is not installed on the server")
+        return requested
+
+    # Plain JSON comes first so that */* and ties keep the default format
+    offers = ['json', 'columnar'] + (['msgpack'] if msgpack_available() else [])
+    best = accept_mimetypes.best_match([WIRE_FORMATS[name] for name in offers], default=WIRE_FORMATS['json'])
+    return next(name for name in offers if WIRE_FORMATS[name] == best)
+
+
+def _columns(tasks):
+    if hasattr(tasks, 'columns'):
+        # TaskSnapshot: reuse its column lists; fields it doesn't load are null
+        missing = [None] * len(tasks)
+        return [tasks.columns.get(name, missing) for name in TASK_FIELDS]
+    return [[getattr(task, name, None) for task in tasks] for name in TASK_FIELDS]
+
+
+def columnar_payload(tasks):
+    """{'fields', 'datetime_fields', 'rows'} document for a list of tasks or a TaskSnapshot"""
+    columns = _columns(tasks)
+    for index, name in enumerate(TASK_FIELDS):
+        if name in DATETIME_FIELDS:
+            columns[index] = [
+                None if moment is None else (moment - _EPOCH) // _MILLISECOND for moment in columns[index]
+            ]
+    return {
+        'fields': list(TASK_FIELDS),
+        'datetime_fields': list(DATETIME_FIELDS),
+        'rows': [list(row) for row in zip(*columns)],
+    }
+
+
+def encode_tasks(tasks, wire_format):
+    """Encode tasks in one of the compact formats. Returns (body bytes, mimetype)."""
+    payload = columnar_payload(tasks)
+    if wire_format == 'msgpack':
+        import msgpack
+
+        return msgpack.packb(payload, use_bin_type=True), MSGPACK_MIMETYPE
+    if wire_format == 'columnar':
+        return json.dumps(payload, separators=(',', ':')).encode(), COLUMNAR_JSON_MIMETYPE
+    raise UnsupportedFormat(f"'{wire_format}' is not a compact task format")
+
+
+def compress_body(body, accept_encodings, min_size=1024):
+    """
+    Compress a response body with the best encoding the client accepts.
+    Returns (body, content encoding), with encoding None when the body was left alone.
+    """
+    if len(body) < min_size:
+        return body, None
+    if accept_encodings['br'] and brotli_available():
+        import brotli
+
+        # Quality 5 compresses close to the maximum at a fraction of its CPU cost
+        return brotli.compress(body, quality=5), 'br'
+    if accept_encodings['gzip']:
+        return gzip.compress(body, compresslevel=6), 'gzip'
+    return body, None
+
+
+def task_list_response(app, request, tasks):
+    """A task list in the wire format `request` negotiated, built with `app`'s response class"""
+    try:
+        wire_format = negotiate_format(request.args, request.accept_mimetypes)
+    except UnsupportedFormat as e:
+        return app.json.response({'error': str(e)}), 406
+
+    if wire_format == 'json':
+        response = app.json.response(tasks_schema.dump(tasks))
+    else:
+        body, mimetype = encode_tasks(tasks, wire_format)
+        response = app.response_class(body, mimetype=mimetype)
+    response.vary.add('Accept')
+    return response
+
+
+def compressible(response):
+    """Whether compress_response may rewrite this response's body"""
+    return (
+        not getattr(response, 'direct_passthrough', False)
+        and response.status_code == 200
+        and 'Content-Encoding' not in response.headers
+    )
+
+
+def compress_response(response, body, accept_encodings, min_size=1024):
+    """Compress a compressible() response whose body is `body` in place; returns the response"""
+    response.vary.add('Accept-Encoding')
+    body, encoding = compress_body(body, accept_encodings, min_size)
+    if encoding:
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+    return response
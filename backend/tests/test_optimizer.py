@@ -0,0 +1,75 @@
+"""Exact optimizer mode against the stochastic lion search and against brute force."""
+
+import itertools
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from services.optimizer import (
+    HIGH_PRIORITY, MEDIUM_PRIORITY, LOW_PRIORITY,
+    calculate_fitness, exact_priorities, lion_optimization, task_weights,
+)
+
+
+def make_tasks(count, seed):
+    """Pending tasks with a mix of deadlines, ages and importance scores"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    return [
+        SimpleNamespace(
+            id=i,
+            title=f"Task {i}",
+            description='',
+            deadline=now + timedelta(days=rng.uniform(-5, 40)) if rng.random() < 0.7 else None,
+            created_at=now - timedelta(days=rng.uniform(0, 30)),
+            importance_score=rng.random(),
+            importance_explanation='',
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize('count', [1, 5, 10, 100, 1000])
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_exact_matches_or_beats_lion(count, seed):
+    tasks = make_tasks(count, seed)
+    np.random.seed(seed)
+    lion = lion_optimization(tasks, mode='lion')
+
+    weights = task_weights(tasks)
+    exact = exact_priorities(weights)
+    assert calculate_fitness(exact, weights) >= calculate_fitness(lion, weights) - 1e-9
+
+
+def brute_force_fitness(weights):
+    return max(
+        calculate_fitness(np.array(assignment), weights)
+        for assignment in itertools.product((HIGH_PRIORITY, MEDIUM_PRIORITY, LOW_PRIORITY), repeat=len(weights))
+    )
+
+
+@pytest.mark.parametrize('count', range(1, 9))
+@pytest.mark.parametrize('seed', range(5))
+def test_exact_priorities_is_optimal(count, seed):
+    rng = np.random.default_rng(seed)
+    weights = rng.random(count)
+    weights /= weights.max()
+
+    exact = exact_priorities(weights)
+    assert set(exact) <= {HIGH_PRIORITY, MEDIUM_PRIORITY, LOW_PRIORITY}
+    assert calculate_fitness(exact, weights) == pytest.approx(brute_force_fitness(weights), abs=1e-9)
+
+
+@pytest.mark.parametrize('weights', [
+    [1.0] * 8,
+    [1.0, 0.0, 0.0, 0.0, 0.0],
+    [1.0, 1.0, 0.5, 0.5, 0.01, 0.01, 0.01],
+])
+def test_exact_priorities_is_optimal_with_ties(weights):
+    weights = np.array(weights)
+    assert calculate_fitness(exact_priorities(weights), weights) == pytest.approx(
+        brute_force_fitness(weights), abs=1e-9
+    )
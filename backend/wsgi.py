@@ -1,4 +1,13 @@
-from app import app
+import os
+from app import create_app
+from services.archiver import start_archiver
+
+app = create_app()
+
+# Move old completed tasks out of the hot table in the background; under the
+# debug reloader only the serving process does, not the watcher
+if __name__ != '__main__' or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+    start_archiver(app)
 
 if __name__ == '__main__':
-    app.run(debug=True) 
\ No newline at end of file
+    app.run(debug=True)
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { 
   ThemeProvider, 
   createTheme, 
@@ -37,7 +37,7 @@ import {
 import TaskList from './components/TaskList';
 import TaskForm from './components/TaskForm';
 import { Task } from './types';
-import { fetchTasks, createTask, updateTask, deleteTask, optimizeTasks } from './api';
+import { fetchTasks, fetchTaskStats, createTask, updateTask, deleteTask, optimizeTasks } from './api';
 
 // Create a theme with both light and dark mode
 const createAppTheme = (mode: 'light' | 'dark') => createTheme({
@@ -103,6 +103,8 @@ const createAppTheme = (mode: 'light' | 'dark') => createTheme({
 
 function App() {
   const [tasks, setTasks] = useState<Task[]>([]);
+  // Completed tasks the server moved to the archive; they are no longer part of `tasks`
+  const [archivedCount, setArchivedCount] = useState<number>(0);
   const [loading, setLoading] = useState<boolean>(true);
   const [error, setError] = useState<string | null>(null);
   const [drawerOpen, setDrawerOpen] = useState<boolean>(false);
@@ -117,12 +119,17 @@ function App() {
     setMode(prevMode => prevMode === 'light' ? 'dark' : 'light');
   };
 
+  const showNotification = useCallback((message: string, type: 'success' | 'error' | 'info') => {
+    setNotification({ message, type });
+  }, []);
+
   const fetchAllTasks = async () => {
     try {
       setLoading(true);
       setError(null);
-      const fetchedTasks = await fetchTasks();
+      const [fetchedTasks, stats] = await Promise.all([fetchTasks(), fetchTaskStats()]);
       setTasks(fetchedTasks);
+      setArchivedCount(stats.archived);
     } catch (error) {
       setError('Failed to fetch tasks. Please try again.');
     } finally {
@@ -134,10 +141,21 @@ function App() {
     fetchAllTasks();
   }, []);
 
+  // The handlers below apply each change to the local list instead of re-fetching every task.
+  // Unchanged tasks keep their object identity, so their memoized rows don't re-render.
+  const tasksRef = useRef(tasks);
+  useEffect(() => {
+    tasksRef.current = tasks;
+  }, [tasks]);
+
+  const replaceTask = useCallback((task: Task) => {
+    setTasks(current => current.map(t => (t.id === task.id ? task : t)));
+  }, []);
+
   const handleCreateTask = async (taskData: Omit<Task, 'id'>) => {
     try {
-      await createTask(taskData);
-      await fetchAllTasks();
+      const created = await createTask(taskData);
+      setTasks(current => [...current, created]);
       setAddTaskOpen(false);
       showNotification('Task created successfully', 'success');
     } catch (error) {
@@ -145,10 +163,12 @@ function App() {
     }
   };
 
-  const handleUpdateTask = async (id: number, updates: Partial<Task>) => {
+  const handleUpdateTask = useCallback(async (id: number, updates: Partial<Task>) => {
+    const previous = tasksRef.current.find(t => t.id === id);
+    if (previous) replaceTask({ ...previous, ...updates });
     try {
-      await updateTask(id, updates);
-      await fetchAllTasks();
+      // The server recomputes the importance score, so its copy replaces the optimistic one
+      replaceTask(await updateTask(id, updates));
       if (updates.completed !== undefined) {
         showNotification(
           updates.completed ? 'Task completed!' : 'Task marked as incomplete',
@@ -158,36 +178,42 @@ function App() {
         showNotification('Task updated successfully', 'success');
       }
     } catch (error) {
+      if (previous) replaceTask(previous);
       showNotification('Failed to update task', 'error');
     }
-  };
+  }, [replaceTask, showNotification]);
 
-  const handleDeleteTask = async (id: number) => {
+  const handleDeleteTask = useCallback(async (id: number) => {
+    const index = tasksRef.current.findIndex(t => t.id === id);
+    const removed = tasksRef.current[index];
+    setTasks(current => current.filter(t => t.id !== id));
     try {
       await deleteTask(id);
-      await fetchAllTasks();
       showNotification('Task deleted successfully', 'success');
     } catch (error) {
+      if (removed) {
+        setTasks(current => [...current.slice(0, index), removed, ...current.slice(index)]);
+      }
       showNotification('Failed to delete task', 'error');
     }
-  };
+  }, [showNotification]);
 
-  const handleOptimize = async () => {
+  const handleOptimize = useCallback(async () => {
     try {
       setLoading(true);
-      await optimizeTasks();
-      await fetchAllTasks();
+      const optimized = await optimizeTasks();
+      // Only pending tasks come back (or a message when there are none); merge them in place
+      if (Array.isArray(optimized)) {
+        const byId = new Map(optimized.map(task => [task.id, task]));
+        setTasks(current => current.map(t => byId.get(t.id) ?? t));
+      }
       showNotification('Tasks optimized successfully!', 'success');
     } catch (error) {
       showNotification('Failed to optimize tasks', 'error');
     } finally {
       setLoading(false);
     }
-  };
-
-  const showNotification = (message: string, type: 'success' | 'error' | 'info') => {
-    setNotification({ message, type });
-  };
+  }, [showNotification]);
 
   const handleCloseNotification = () => {
     setNotification(null);
@@ -364,6 +390,7 @@ function App() {
               )}
               <TaskList
                 tasks={tasks}
+                archivedCount={archivedCount}
                 onUpdateTask={handleUpdateTask}
                 onDeleteTask={handleDeleteTask}
                 onOptimize={handleOptimize}
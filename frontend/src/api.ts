@@ -10,9 +10,31 @@ const api = axios.create({
   },
 });
 
+// Columnar task lists: field names once, one array per task, datetimes as epoch milliseconds (UTC)
+interface ColumnarTasks {
+  fields: string[];
+  datetime_fields: string[];
+  rows: unknown[][];
+}
+
+export const decodeColumnarTasks = ({ fields, datetime_fields, rows }: ColumnarTasks): Task[] => {
+  const datetimeColumns = new Set(datetime_fields);
+  return rows.map((row) => {
+    const task: Record<string, unknown> = {};
+    fields.forEach((field, index) => {
+      const value = row[index];
+      // Same naive-UTC ISO strings the plain JSON format sends
+      task[field] = datetimeColumns.has(field) && value !== null
+        ? new Date(value as number).toISOString().slice(0, -1)
+        : value;
+    });
+    return task as unknown as Task;
+  });
+};
+
 export const fetchTasks = async (): Promise<Task[]> => {
-  const response = await api.get('/tasks');
-  return response.data;
+  const response = await api.get('/tasks', { params: { format: 'columnar' } });
+  return decodeColumnarTasks(response.data);
 };
 
 export const createTask = async (taskData: TaskFormData): Promise<Task> => {
@@ -30,6 +52,91 @@ export const deleteTask = async (taskId: number): Promise<void> => {
 };
 
 export const optimizeTasks = async (): Promise<Task[]> => {
-  const response = await api.post('/tasks/optimize');
+  const response = await api.post('/tasks/optimize', null, { params: { format: 'columnar' } });
+  // "No pending tasks" comes back as a plain message
+  return Array.isArray(response.data?.rows) ? decodeColumnarTasks(response.data) : response.data;
+}; 
+
+export const fetchNextTasks = async (k: number = 5): Promise<Task[]> => {
+  const response = await api.get('/tasks/next', { params: { k } });
   return response.data;
-}; 
\ No newline at end of file
+};
+
+export interface TaskStats {
+  total: number;
+  completed: number;  // Includes archived tasks
+  archived: number;
+  pending: number;
+  pending_by_priority: Record<Task['priority'], number>;
+  overdue: number;
+  due_this_week: number;
+  generated_at: string;
+}
+
+export const fetchTaskStats = async (): Promise<TaskStats> => {
+  const response = await api.get('/tasks/stats');
+  return response.data;
+};
+
+export interface TaskSearchResult extends Task {
+  rank: number | null;
+  snippet: string | null;
+}
+
+export interface TaskSearchResponse {
+  results: TaskSearchResult[];
+  total: number;
+  limit: number;
+  offset: number;
+}
+
+export const searchTasks = async (
+  q: string,
+  options: { completed?: boolean; priority?: Task['priority']; limit?: number; offset?: number } = {}
+): Promise<TaskSearchResponse> => {
+  const response = await api.get('/tasks/search', { params: { q, ...options } });
+  return response.data;
+};
+
+export interface ArchivedTask extends Task {
+  archived_at: string;
+}
+
+export interface ArchivedTasksResponse {
+  results: ArchivedTask[];
+  total: number;
+  limit: number;
+  offset: number;
+}
+
+export const fetchArchivedTasks = async (
+  options: { limit?: number; offset?: number } = {}
+): Promise<ArchivedTasksResponse> => {
+  const response = await api.get('/tasks/archive', { params: options });
+  return response.data;
+};
+
+export interface TaskDependencies {
+  task_id: number;
+  depends_on: number[];
+  blocks: number[];
+  blocked: boolean;
+  depth: number;
+  earliest_start: string;
+  latest_finish: string | null;
+  slack_days: number | null;
+}
+
+export const fetchTaskDependencies = async (taskId: number): Promise<TaskDependencies> => {
+  const response = await api.get(`/tasks/${taskId}/dependencies`);
+  return response.data;
+};
+
+export const addTaskDependency = async (taskId: number, dependsOn: number): Promise<TaskDependencies> => {
+  const response = await api.post(`/tasks/${taskId}/dependencies`, { depends_on: dependsOn });
+  return response.data;
+};
+
+export const removeTaskDependency = async (taskId: number, dependsOn: number): Promise<void> => {
+  await api.delete(`/tasks/${taskId}/dependencies/${dependsOn}`);
+};
@@ -0,0 +1,83 @@
+import React from 'react';
+import { render, screen, within } from '@testing-library/react';
+import TaskList from './TaskList';
+import { Task } from '../types';
+
+// Every task row renders exactly one checkbox, so counting checkbox renders counts row renders
+const mockRowRender = jest.fn();
+jest.mock('@mui/material', () => {
+  const actual = jest.requireActual('@mui/material');
+  const { createElement } = jest.requireActual('react');
+  return {
+    ...actual,
+    Checkbox: (props: object) => {
+      mockRowRender();
+      return createElement(actual.Checkbox, props);
+    },
+  };
+});
+
+const TASK_COUNT = 10000;
+
+const makeTasks = (count: number): Task[] =>
+  Array.from({ length: count }, (_, index) => ({
+    id: index + 1,
+    title: `Task ${index + 1}`,
+    description: 'Collect numbers from every team and draft the summary.',
+    deadline: index % 3 === 0 ? null : '2030-01-01T09:00:00',
+    priority: (['low', 'medium', 'high'] as const)[index % 3],
+    completed: index % 4 === 0,
+    created_at: '2025-01-01T09:00:00',
+    importance_score: index % 2 === 0 ? (index % 100) / 100 : null,
+    importance_explanation: index % 2 === 0 ? 'Due within a week.' : null,
+  }));
+
+const renderBoard = (tasks: Task[]) => {
+  const handlers = { onUpdateTask: jest.fn(), onDeleteTask: jest.fn(), onOptimize: jest.fn() };
+  const result = render(<TaskList tasks={tasks} {...handlers} />);
+  return { ...result, rerenderWith: (items: Task[]) => result.rerender(<TaskList tasks={items} {...handlers} />) };
+};
+
+beforeEach(() => {
+  mockRowRender.mockClear();
+});
+
+test(`renders a board of ${TASK_COUNT} tasks as a small window of rows`, () => {
+  const tasks = makeTasks(TASK_COUNT);
+  renderBoard(tasks);
+
+  // Only the rows around the viewport exist in the DOM, and only those were rendered
+  const rows = screen.getAllByRole('checkbox');
+  expect(rows.length).toBeGreaterThan(0);
+  expect(rows.length).toBeLessThan(50);
+  expect(mockRowRender).toHaveBeenCalledTimes(rows.length);
+  expect(screen.getByText('Task 1')).toBeInTheDocument();
+  expect(screen.queryByText(`Task ${TASK_COUNT}`)).not.toBeInTheDocument();
+
+  // Dashboard counters still cover every task, not just the mounted ones
+  const completedCounter = screen.getByText('Completed Tasks').parentElement as HTMLElement;
+  expect(within(completedCounter).getByText(String(tasks.filter(t => t.completed).length))).toBeInTheDocument();
+});
+
+test(`updating one of ${TASK_COUNT} tasks re-renders only its row`, () => {
+  const tasks = makeTasks(TASK_COUNT);
+  const { rerenderWith } = renderBoard(tasks);
+  const mountedRows = screen.getAllByRole('checkbox').length;
+  mockRowRender.mockClear();
+
+  // What App does with an update response: a new array sharing every untouched task
+  const updated = tasks.map(task => (task.id === 2 ? { ...task, title: 'Renamed task' } : task));
+  rerenderWith(updated);
+
+  expect(screen.getByText('Renamed task')).toBeInTheDocument();
+  expect(screen.getAllByRole('checkbox')).toHaveLength(mountedRows);
+  expect(mockRowRender).toHaveBeenCalledTimes(1);
+});
+
+test('counts archived tasks as completed', () => {
+  const tasks = makeTasks(4);
+  render(<TaskList tasks={tasks} archivedCount={5} onUpdateTask={jest.fn()} onDeleteTask={jest.fn()} onOptimize={jest.fn()} />);
+
+  const completedCounter = screen.getByText('Completed Tasks').parentElement as HTMLElement;
+  expect(within(completedCounter).getByText('6')).toBeInTheDocument();
+});
@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useCallback, useMemo, useState } from 'react';
 import {
   List,
   ListItem,
@@ -34,9 +34,12 @@ import {
 } from '@mui/icons-material';
 import { motion, AnimatePresence } from 'framer-motion';
 import { Task } from '../types';
+import VirtualList from './VirtualList';
 
 interface TaskListProps {
   tasks: Task[];
+  // Archived tasks aren't in `tasks` but still count as completed
+  archivedCount?: number;
   onUpdateTask: (id: number, updates: Partial<Task>) => void;
   onDeleteTask: (id: number) => void;
   onOptimize: () => void;
@@ -85,27 +88,317 @@ const getTimeAgo = (dateString: string) => {
   return `${diffDays} day${diffDays > 1 ? 's' : ''} ago`;
 };
 
+const formatDate = (dateString: string | null) => {
+  if (!dateString) return '';
+  const date = new Date(dateString);
+  return date.toLocaleString();
+};
+
+const getTaskKey = (task: Task) => task.id;
+
+// Collapsed card with an analysis section; rows are measured once rendered
+const ESTIMATED_ROW_HEIGHT = 200;
+
+interface TaskRowProps {
+  task: Task;
+  expanded: boolean;
+  onToggleComplete: (task: Task) => void;
+  onDelete: (id: number) => void;
+  onToggleExpand: (id: number) => void;
+}
+
+// Memoized so that an edit, or expanding a task, only re-renders the rows involved
+const TaskRow = React.memo(({
+  task,
+  expanded,
+  onToggleComplete,
+  onDelete,
+  onToggleExpand,
+}: TaskRowProps) => (
+  // Padding rather than a margin on the card, so the measured row height includes the gap
+  <Box sx={{ pb: 2 }}>
+    <Card 
+      elevation={1} 
+      sx={{ 
+        borderRadius: 3,
+        position: 'relative',
+        overflow: 'visible',
+        transition: 'all 0.2s ease',
+        '&:hover': {
+          transform: 'translateY(-2px)',
+          boxShadow: '0 6px 12px rgba(0,0,0,0.1)',
+        },
+        border: task.completed ? '1px solid #e0e0e0' : '1px solid transparent',
+        bgcolor: task.completed ? '#f9f9f9' : 'background.paper',
+      }}
+    >
+      {task.priority === 'high' && !task.completed && (
+        <Box 
+          sx={{ 
+            position: 'absolute', 
+            top: -8, 
+            right: 16, 
+            bgcolor: getPriorityColor('high'),
+            color: 'white',
+            borderRadius: 4,
+            px: 1.5,
+            py: 0.5,
+            fontSize: '0.75rem',
+            fontWeight: 'bold',
+            boxShadow: '0 2px 8px rgba(239,83,80,0.5)',
+          }}
+        >
+          Priority
+        </Box>
+      )}
+
+      <ListItem sx={{ px: 3, py: 2 }}>
+        <Stack spacing={2} sx={{ width: '100%' }}>
+          <Stack direction="row" alignItems="center" spacing={2}>
+            <Checkbox
+              checked={task.completed}
+              onChange={() => onToggleComplete(task)}
+              color="primary"
+              sx={{
+                '& .MuiSvgIcon-root': { fontSize: 28 },
+              }}
+            />
+            <Box sx={{ flexGrow: 1 }}>
+              <Typography
+                variant="h6"
+                sx={{
+                  textDecoration: task.completed ? 'line-through' : 'none',
+                  color: task.completed ? 'text.secondary' : 'text.primary',
+                  fontWeight: task.completed ? 'normal' : 'bold',
+                }}
+              >
+                {task.title}
+              </Typography>
+              {task.description && (
+                <Typography
+                  variant="body2"
+                  color="text.secondary"
+                  sx={{
+                    textDecoration: task.completed ? 'line-through' : 'none',
+                    mt: 0.5,
+                  }}
+                >
+                  {task.description}
+                </Typography>
+              )}
+            </Box>
+            <IconButton
+              onClick={() => onDelete(task.id)}
+              size="small"
+              color="error"
+              sx={{ 
+                bgcolor: 'rgba(244,67,54,0.1)',
+                '&:hover': {
+                  bgcolor: 'rgba(244,67,54,0.2)',
+                }
+              }}
+            >
+              <DeleteIcon />
+            </IconButton>
+          </Stack>
+
+          {/* Tags and Metadata */}
+          <Stack direction="row" spacing={1} flexWrap="wrap" useFlexGap>
+            <Chip
+              icon={<FlagIcon />}
+              label={task.priority.toUpperCase()}
+              size="small"
+              sx={{
+                bgcolor: `${getPriorityColor(task.priority)}15`,
+                color: getPriorityColor(task.priority),
+                fontWeight: 'bold',
+                '& .MuiChip-icon': {
+                  color: getPriorityColor(task.priority),
+                },
+              }}
+            />
+            {task.deadline && (
+              <Chip
+                icon={<ScheduleIcon />}
+                label={formatDate(task.deadline)}
+                size="small"
+                sx={{
+                  bgcolor: 'rgba(25,118,210,0.1)',
+                  color: 'primary.main',
+                  '& .MuiChip-icon': {
+                    color: 'primary.main',
+                  },
+                }}
+              />
+            )}
+            <Chip
+              icon={<AccessTimeIcon sx={{ fontSize: '0.8rem' }} />}
+              label={`Created ${getTimeAgo(task.created_at)}`}
+              size="small"
+              variant="outlined"
+              sx={{ 
+                fontSize: '0.75rem', 
+                height: '24px',
+                '& .MuiChip-label': { px: 1 }
+              }}
+            />
+            {task.importance_score !== null && (
+              <Chip
+                icon={<AIIcon sx={{ fontSize: '0.8rem' }} />}
+                label={`${Math.round(task.importance_score * 100)}% Important`}
+                size="small"
+                sx={{
+                  bgcolor: `${getImportanceColor(task.importance_score)}15`,
+                  color: getImportanceColor(task.importance_score),
+                  fontWeight: 'medium',
+                  height: '24px',
+                  '& .MuiChip-icon': {
+                    color: getImportanceColor(task.importance_score),
+                  },
+                  '& .MuiChip-label': { px: 1 }
+                }}
+              />
+            )}
+          </Stack>
+
+          {/* AI Analysis Section */}
+          {task.importance_score !== null && (
+            <>
+              <Box sx={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center' }}>
+                <Box sx={{ display: 'flex', alignItems: 'center', gap: 1 }}>
+                  <AIIcon sx={{ color: 'primary.main', fontSize: 20 }} />
+                  <Typography variant="body2" fontWeight="medium">
+                    Analysis {task.analysis_time ? `(${getTimeAgo(task.analysis_time)})` : ''}
+                  </Typography>
+                </Box>
+                <Button
+                  size="small"
+                  endIcon={expanded ? <ExpandLessIcon /> : <ExpandMoreIcon />}
+                  onClick={() => onToggleExpand(task.id)}
+                  sx={{ textTransform: 'none', fontSize: '0.8rem' }}
+                >
+                  {expanded ? 'Hide Details' : 'View Details'}
+                </Button>
+              </Box>
+
+              <Box sx={{ width: '100%' }}>
+                <LinearProgress
+                  variant="determinate"
+                  value={task.importance_score * 100}
+                  sx={{
+                    height: 8,
+                    borderRadius: 4,
+                    bgcolor: '#e0e0e0',
+                    mb: 1,
+                    '& .MuiLinearProgress-bar': {
+                      bgcolor: getImportanceColor(task.importance_score),
+                    }
+                  }}
+                />
+                <Box sx={{ display: 'flex', justifyContent: 'space-between' }}>
+                  <Typography variant="caption" sx={{ fontWeight: 'medium' }}>
+                    {getImportanceLabel(task.importance_score)}
+                  </Typography>
+                  <Typography variant="caption" sx={{ fontWeight: 'bold' }}>
+                    {Math.round(task.importance_score * 100)}%
+                  </Typography>
+                </Box>
+              </Box>
+
+              <Collapse in={expanded}>
+                <Paper
+                  elevation={0}
+                  sx={{
+                    p: 2,
+                    mt: 1,
+                    bgcolor: 'rgba(25,118,210,0.05)',
+                    borderRadius: 2,
+                    border: '1px solid rgba(25,118,210,0.1)',
+                  }}
+                >
+                  <Typography variant="body2" color="text.secondary" gutterBottom>
+                    {task.importance_explanation}
+                  </Typography>
+
+                  {task.insights && task.insights.length > 0 && (
+                    <>
+                      <Divider sx={{ my: 1.5 }} />
+                      <Typography variant="body2" fontWeight="medium" sx={{ display: 'flex', alignItems: 'center', gap: 0.5, mb: 1 }}>
+                        <LightbulbIcon sx={{ fontSize: 16, color: 'warning.main' }} />
+                        Insights:
+                      </Typography>
+
+                      <Stack spacing={0.5}>
+                        {task.insights.map((insight, idx) => (
+                          <Typography 
+                            key={idx} 
+                            variant="body2" 
+                            sx={{ 
+                              display: 'flex',
+                              alignItems: 'center',
+                              gap: 1,
+                              color: 'text.secondary',
+                              '&:before': {
+                                content: '"•"',
+                                color: 'primary.main',
+                                fontWeight: 'bold'
+                              }
+                            }}
+                          >
+                            {insight}
+                          </Typography>
+                        ))}
+                      </Stack>
+                    </>
+                  )}
+                </Paper>
+              </Collapse>
+            </>
+          )}
+        </Stack>
+      </ListItem>
+    </Card>
+  </Box>
+));
+
 const TaskList: React.FC<TaskListProps> = ({
   tasks,
+  archivedCount = 0,
   onUpdateTask,
   onDeleteTask,
   onOptimize,
 }) => {
   const [expandedTask, setExpandedTask] = useState<number | null>(null);
 
-  const formatDate = (dateString: string | null) => {
-    if (!dateString) return '';
-    const date = new Date(dateString);
-    return date.toLocaleString();
-  };
+  const counts = useMemo(() => {
+    let active = 0;
+    let highPriority = 0;
+    for (const task of tasks) {
+      if (!task.completed) {
+        active++;
+        if (task.priority === 'high') highPriority++;
+      }
+    }
+    return { active, completed: tasks.length - active + archivedCount, highPriority };
+  }, [tasks, archivedCount]);
 
-  const handleToggleComplete = (task: Task) => {
+  const handleToggleComplete = useCallback((task: Task) => {
     onUpdateTask(task.id, { completed: !task.completed });
-  };
+  }, [onUpdateTask]);
+
+  const toggleExpandTask = useCallback((taskId: number) => {
+    setExpandedTask(current => (current === taskId ? null : taskId));
+  }, []);
 
-  const toggleExpandTask = (taskId: number) => {
-    setExpandedTask(expandedTask === taskId ? null : taskId);
-  };
+  const renderTask = useCallback((task: Task) => (
+    <TaskRow
+      task={task}
+      expanded={expandedTask === task.id}
+      onToggleComplete={handleToggleComplete}
+      onDelete={onDeleteTask}
+      onToggleExpand={toggleExpandTask}
+    />
+  ), [expandedTask, handleToggleComplete, onDeleteTask, toggleExpandTask]);
 
   return (
     <Box>
@@ -164,7 +457,7 @@ const TaskList: React.FC<TaskListProps> = ({
                   }}
                 >
                   <Typography variant="h4" fontWeight="bold">
-                    {tasks.filter(t => !t.completed).length}
+                    {counts.active}
                   </Typography>
                   <Typography variant="body2">Active Tasks</Typography>
                 </Paper>
@@ -181,7 +474,7 @@ const TaskList: React.FC<TaskListProps> = ({
                   }}
                 >
                   <Typography variant="h4" fontWeight="bold">
-                    {tasks.filter(t => t.completed).length}
+                    {counts.completed}
                   </Typography>
                   <Typography variant="body2">Completed Tasks</Typography>
                 </Paper>
@@ -198,7 +491,7 @@ const TaskList: React.FC<TaskListProps> = ({
                   }}
                 >
                   <Typography variant="h4" fontWeight="bold">
-                    {tasks.filter(t => t.priority === 'high' && !t.completed).length}
+                    {counts.highPriority}
                   </Typography>
                   <Typography variant="body2">High Priority</Typography>
                 </Paper>
@@ -275,259 +568,12 @@ const TaskList: React.FC<TaskListProps> = ({
           </motion.div>
         ) : (
           <List sx={{ p: 0 }}>
-            {tasks.map((task) => (
-              <motion.div
-                key={task.id}
-                layout
-                initial={{ opacity: 0, y: 20 }}
-                animate={{ opacity: 1, y: 0 }}
-                exit={{ opacity: 0, y: -20 }}
-                transition={{ duration: 0.2 }}
-              >
-                <Card 
-                  elevation={1} 
-                  sx={{ 
-                    mb: 2, 
-                    borderRadius: 3,
-                    position: 'relative',
-                    overflow: 'visible',
-                    transition: 'all 0.2s ease',
-                    '&:hover': {
-                      transform: 'translateY(-2px)',
-                      boxShadow: '0 6px 12px rgba(0,0,0,0.1)',
-                    },
-                    border: task.completed ? '1px solid #e0e0e0' : '1px solid transparent',
-                    bgcolor: task.completed ? '#f9f9f9' : 'background.paper',
-                  }}
-                >
-                  {task.priority === 'high' && !task.completed && (
-                    <Box 
-                      sx={{ 
-                        position: 'absolute', 
-                        top: -8, 
-                        right: 16, 
-                        bgcolor: getPriorityColor('high'),
-                        color: 'white',
-                        borderRadius: 4,
-                        px: 1.5,
-                        py: 0.5,
-                        fontSize: '0.75rem',
-                        fontWeight: 'bold',
-                        boxShadow: '0 2px 8px rgba(239,83,80,0.5)',
-                      }}
-                    >
-                      Priority
-                    </Box>
-                  )}
-
-                  <ListItem sx={{ px: 3, py: 2 }}>
-                    <Stack spacing={2} sx={{ width: '100%' }}>
-                      <Stack direction="row" alignItems="center" spacing={2}>
-                        <Checkbox
-                          checked={task.completed}
-                          onChange={() => handleToggleComplete(task)}
-                          color="primary"
-                          sx={{
-                            '& .MuiSvgIcon-root': { fontSize: 28 },
-                          }}
-                        />
-                        <Box sx={{ flexGrow: 1 }}>
-                          <Typography
-                            variant="h6"
-                            sx={{
-                              textDecoration: task.completed ? 'line-through' : 'none',
-                              color: task.completed ? 'text.secondary' : 'text.primary',
-                              fontWeight: task.completed ? 'normal' : 'bold',
-                            }}
-                          >
-                            {task.title}
-                          </Typography>
-                          {task.description && (
-                            <Typography
-                              variant="body2"
-                              color="text.secondary"
-                              sx={{
-                                textDecoration: task.completed ? 'line-through' : 'none',
-                                mt: 0.5,
-                              }}
-                            >
-                              {task.description}
-                            </Typography>
-                          )}
-                        </Box>
-                        <IconButton
-                          onClick={() => onDeleteTask(task.id)}
-                          size="small"
-                          color="error"
-                          sx={{ 
-                            bgcolor: 'rgba(244,67,54,0.1)',
-                            '&:hover': {
-                              bgcolor: 'rgba(244,67,54,0.2)',
-                            }
-                          }}
-                        >
-                          <DeleteIcon />
-                        </IconButton>
-                      </Stack>
-
-                      {/* Tags and Metadata */}
-                      <Stack direction="row" spacing={1} flexWrap="wrap" useFlexGap>
-                        <Chip
-                          icon={<FlagIcon />}
-                          label={task.priority.toUpperCase()}
-                          size="small"
-                          sx={{
-                            bgcolor: `${getPriorityColor(task.priority)}15`,
-                            color: getPriorityColor(task.priority),
-                            fontWeight: 'bold',
-                            '& .MuiChip-icon': {
-                              color: getPriorityColor(task.priority),
-                            },
-                          }}
-                        />
-                        {task.deadline && (
-                          <Chip
-                            icon={<ScheduleIcon />}
-                            label={formatDate(task.deadline)}
-                            size="small"
-                            sx={{
-                              bgcolor: 'rgba(25,118,210,0.1)',
-                              color: 'primary.main',
-                              '& .MuiChip-icon': {
-                                color: 'primary.main',
-                              },
-                            }}
-                          />
-                        )}
-                        <Chip
-                          icon={<AccessTimeIcon sx={{ fontSize: '0.8rem' }} />}
-                          label={`Created ${getTimeAgo(task.created_at)}`}
-                          size="small"
-                          variant="outlined"
-                          sx={{ 
-                            fontSize: '0.75rem', 
-                            height: '24px',
-                            '& .MuiChip-label': { px: 1 }
-                          }}
-                        />
-                        {task.importance_score !== null && (
-                          <Chip
-                            icon={<AIIcon sx={{ fontSize: '0.8rem' }} />}
-                            label={`${Math.round(task.importance_score * 100)}% Important`}
-                            size="small"
-                            sx={{
-                              bgcolor: `${getImportanceColor(task.importance_score)}15`,
-                              color: getImportanceColor(task.importance_score),
-                              fontWeight: 'medium',
-                              height: '24px',
-                              '& .MuiChip-icon': {
-                                color: getImportanceColor(task.importance_score),
-                              },
-                              '& .MuiChip-label': { px: 1 }
-                            }}
-                          />
-                        )}
-                      </Stack>
-
-                      {/* AI Analysis Section */}
-                      {task.importance_score !== null && (
-                        <>
-                          <Box sx={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center' }}>
-                            <Box sx={{ display: 'flex', alignItems: 'center', gap: 1 }}>
-                              <AIIcon sx={{ color: 'primary.main', fontSize: 20 }} />
-                              <Typography variant="body2" fontWeight="medium">
-                                Analysis {task.analysis_time ? `(${getTimeAgo(task.analysis_time)})` : ''}
-                              </Typography>
-                            </Box>
-                            <Button
-                              size="small"
-                              endIcon={expandedTask === task.id ? <ExpandLessIcon /> : <ExpandMoreIcon />}
-                              onClick={() => toggleExpandTask(task.id)}
-                              sx={{ textTransform: 'none', fontSize: '0.8rem' }}
-                            >
-                              {expandedTask === task.id ? 'Hide Details' : 'View Details'}
-                            </Button>
-                          </Box>
-                          
-                          <Box sx={{ width: '100%' }}>
-                            <LinearProgress
-                              variant="determinate"
-                              value={task.importance_score * 100}
-                              sx={{
-                                height: 8,
-                                borderRadius: 4,
-                                bgcolor: '#e0e0e0',
-                                mb: 1,
-                                '& .MuiLinearProgress-bar': {
-                                  bgcolor: getImportanceColor(task.importance_score),
-                                }
-                              }}
-                            />
-                            <Box sx={{ display: 'flex', justifyContent: 'space-between' }}>
-                              <Typography variant="caption" sx={{ fontWeight: 'medium' }}>
-                                {getImportanceLabel(task.importance_score)}
-                              </Typography>
-                              <Typography variant="caption" sx={{ fontWeight: 'bold' }}>
-                                {Math.round(task.importance_score * 100)}%
-                              </Typography>
-                            </Box>
-                          </Box>
-                          
-                          <Collapse in={expandedTask === task.id}>
-                            <Paper
-                              elevation={0}
-                              sx={{
-                                p: 2,
-                                mt: 1,
-                                bgcolor: 'rgba(25,118,210,0.05)',
-                                borderRadius: 2,
-                                border: '1px solid rgba(25,118,210,0.1)',
-                              }}
-                            >
-                              <Typography variant="body2" color="text.secondary" gutterBottom>
-                                {task.importance_explanation}
-                              </Typography>
-                              
-                              {task.insights && task.insights.length > 0 && (
-                                <>
-                                  <Divider sx={{ my: 1.5 }} />
-                                  <Typography variant="body2" fontWeight="medium" sx={{ display: 'flex', alignItems: 'center', gap: 0.5, mb: 1 }}>
-                                    <LightbulbIcon sx={{ fontSize: 16, color: 'warning.main' }} />
-                                    Insights:
-                                  </Typography>
-                                  
-                                  <Stack spacing={0.5}>
-                                    {task.insights.map((insight, idx) => (
-                                      <Typography 
-                                        key={idx} 
-                                        variant="body2" 
-                                        sx={{ 
-                                          display: 'flex',
-                                          alignItems: 'center',
-                                          gap: 1,
-                                          color: 'text.secondary',
-                                          '&:before': {
-                                            content: '"•"',
-                                            color: 'primary.main',
-                                            fontWeight: 'bold'
-                                          }
-                                        }}
-                                      >
-                                        {insight}
-                                      </Typography>
-                                    ))}
-                                  </Stack>
-                                </>
-                              )}
-                            </Paper>
-                          </Collapse>
-                        </>
-                      )}
-                    </Stack>
-                  </ListItem>
-                </Card>
-              </motion.div>
-            ))}
+            <VirtualList
+              items={tasks}
+              getKey={getTaskKey}
+              renderItem={renderTask}
+              estimatedItemHeight={ESTIMATED_ROW_HEIGHT}
+            />
           </List>
         )}
       </AnimatePresence>
@@ -0,0 +1,142 @@
+import React, { useCallback, useEffect, useLayoutEffect, useMemo, useRef, useState } from 'react';
+
+interface VirtualListProps<T> {
+  items: T[];
+  getKey: (item: T) => React.Key;
+  renderItem: (item: T) => React.ReactNode;
+  estimatedItemHeight: number;
+  // Extra pixels rendered above and below the viewport so fast scrolling doesn't show gaps
+  overscan?: number;
+}
+
+// First index whose item ends below `position`
+const findIndex = (offsets: Float64Array, position: number) => {
+  let low = 0;
+  let high = offsets.length - 1;
+  while (low < high) {
+    const middle = (low + high) >> 1;
+    if (offsets[middle + 1] <= position) {
+      low = middle + 1;
+    } else {
+      high = middle;
+    }
+  }
+  return low;
+};
+
+interface MeasuredItemProps {
+  itemKey: React.Key;
+  track: (key: React.Key, element: HTMLDivElement) => () => void;
+  children: React.ReactNode;
+}
+
+const MeasuredItem: React.FC<MeasuredItemProps> = ({ itemKey, track, children }) => {
+  const ref = useRef<HTMLDivElement>(null);
+  useLayoutEffect(() => (ref.current ? track(itemKey, ref.current) : undefined), [itemKey, track]);
+  return <div ref={ref}>{children}</div>;
+};
+
+/**
+ * Window-scrolled list that only mounts the items in or near the viewport.
+ * Rendered items are measured; items that were never rendered count as `estimatedItemHeight`.
+ */
+function VirtualList<T>({ items, getKey, renderItem, estimatedItemHeight, overscan = 800 }: VirtualListProps<T>) {
+  const containerRef = useRef<HTMLDivElement>(null);
+  const heights = useRef(new Map<React.Key, number>());
+  const [measureVersion, setMeasureVersion] = useState(0);
+  const [viewport, setViewport] = useState({ top: 0, height: window.innerHeight });
+
+  // Track which part of the list is on screen, at most once per animation frame
+  useEffect(() => {
+    let frame = 0;
+    const update = () => {
+      frame = 0;
+      if (!containerRef.current) return;
+      const top = -containerRef.current.getBoundingClientRect().top;
+      const height = window.innerHeight;
+      setViewport(previous => (previous.top === top && previous.height === height ? previous : { top, height }));
+    };
+    const scheduleUpdate = () => {
+      if (!frame) frame = window.requestAnimationFrame(update);
+    };
+
+    update();
+    window.addEventListener('scroll', scheduleUpdate, { passive: true });
+    window.addEventListener('resize', scheduleUpdate);
+    return () => {
+      window.removeEventListener('scroll', scheduleUpdate);
+      window.removeEventListener('resize', scheduleUpdate);
+      if (frame) window.cancelAnimationFrame(frame);
+    };
+  }, []);
+
+  const recordHeight = useCallback((key: React.Key, height: number) => {
+    // Not laid out (e.g. jsdom): keep the estimate
+    if (height <= 0 || heights.current.get(key) === height) return false;
+    heights.current.set(key, height);
+    return true;
+  }, []);
+
+  // One observer for all rendered items picks up expanded details, wrapped titles, etc.
+  const elementKeys = useRef(new Map<Element, React.Key>());
+  const observer = useMemo(() => {
+    if (typeof ResizeObserver === 'undefined') return null;
+    return new ResizeObserver(entries => {
+      let changed = false;
+      for (const entry of entries) {
+        const key = elementKeys.current.get(entry.target);
+        if (key !== undefined && recordHeight(key, entry.target.getBoundingClientRect().height)) {
+          changed = true;
+        }
+      }
+      if (changed) setMeasureVersion(version => version + 1);
+    });
+  }, [recordHeight]);
+
+  useEffect(() => () => observer?.disconnect(), [observer]);
+
+  const track = useCallback((key: React.Key, element: HTMLDivElement) => {
+    elementKeys.current.set(element, key);
+    if (observer) {
+      observer.observe(element);
+    } else if (recordHeight(key, element.getBoundingClientRect().height)) {
+      setMeasureVersion(version => version + 1);
+    }
+    return () => {
+      elementKeys.current.delete(element);
+      observer?.unobserve(element);
+    };
+  }, [observer, recordHeight]);
+
+  // offsets[i] is the top of item i; offsets[items.length] the total height
+  const offsets = useMemo(() => {
+    const result = new Float64Array(items.length + 1);
+    for (let index = 0; index < items.length; index++) {
+      result[index + 1] = result[index] + (heights.current.get(getKey(items[index])) ?? estimatedItemHeight);
+    }
+    return result;
+    // measureVersion: recompute after rendered items were (re)measured
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [items, getKey, estimatedItemHeight, measureVersion]);
+
+  const start = items.length ? findIndex(offsets, Math.max(0, viewport.top - overscan)) : 0;
+  const end = items.length ? findIndex(offsets, viewport.top + viewport.height + overscan) + 1 : 0;
+  const totalHeight = offsets[items.length];
+
+  return (
+    <div ref={containerRef}>
+      <div style={{ height: offsets[start] }} />
+      {items.slice(start, end).map(item => {
+        const key = getKey(item);
+        return (
+          <MeasuredItem key={key} itemKey={key} track={track}>
+            {renderItem(item)}
+          </MeasuredItem>
+        );
+      })}
+      <div style={{ height: totalHeight - offsets[Math.min(end, items.length)] }} />
+    </div>
+  );
+}
+
+export default VirtualList;
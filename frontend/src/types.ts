@@ -6,6 +6,7 @@ export interface Task {
   priority: 'low' | 'medium' | 'high';
   completed: boolean;
   created_at: string;
+  completed_at?: string | null;
   importance_score: number | null;
   importance_explanation: string | null;
   importance_category?: 'low' | 'medium' | 'high';